@@ -70,6 +70,17 @@ if "*" in FRONTEND_ORIGINS:
 GRAPH_BACKEND = os.getenv("GRAPH_BACKEND", "neo4j").strip().lower()
 if GRAPH_BACKEND not in {"networkx", "neo4j"}:
     raise RuntimeError("Invalid GRAPH_BACKEND. Supported values: networkx, neo4j.")
+# Max job graphs the networkx backend keeps in memory (least recently used evicted).
+GRAPH_CACHE_MAX_JOBS = max(1, int(os.getenv("GRAPH_CACHE_MAX_JOBS", "8")))
+
+# IFC processing
+# Processes used for metadata extraction on large IFC models. Each worker opens its own
+# copy of the model (roughly 10x the .ifc file size in memory), so keep this small.
+METADATA_EXTRACT_WORKERS = max(1, int(os.getenv("METADATA_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1)))))
+# IFC files larger than this (MB) are extracted in a single process to bound memory use.
+METADATA_PARALLEL_MAX_FILE_MB = max(1, int(os.getenv("METADATA_PARALLEL_MAX_FILE_MB", "100")))
+# IFC -> GLB geometry conversion threads (IfcConvert -j / ifcopenshell.geom iterator).
+IFC_CONVERT_THREADS = max(1, int(os.getenv("IFC_CONVERT_THREADS", str((os.cpu_count() or 2) - 1))))
 
 # Neo4j
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687").strip()
@@ -77,6 +88,11 @@ NEO4J_USER = os.getenv("NEO4J_USER", "neo4j").strip()
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "").strip()
 NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j").strip()
 NEO4J_INGEST_BATCH_SIZE = max(100, int(os.getenv("NEO4J_INGEST_BATCH_SIZE", "1000")))
+NEO4J_MAX_CONCURRENCY = max(1, int(os.getenv("NEO4J_MAX_CONCURRENCY", "4")))
+NEO4J_POOL_SIZE = max(1, int(os.getenv("NEO4J_POOL_SIZE", "100")))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+NEO4J_ACQUIRE_TIMEOUT = float(os.getenv("NEO4J_ACQUIRE_TIMEOUT", "60"))
+NEO4J_TRAVERSAL_TIMEOUT = float(os.getenv("NEO4J_TRAVERSAL_TIMEOUT", "5"))
 
 # LLM / OpenRouter
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "").strip()
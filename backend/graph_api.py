@@ -19,12 +19,21 @@ def invalidate_graph_cache(job_id: str) -> None:
     invalidate_graph_store_cache(job_id)
 
 
+async def _call_store(method_name: str, *args: Any, **kwargs: Any) -> Any:
+    """Prefer the backend's `<method>_async` variant so reads stay off the event loop."""
+    store = get_graph_store()
+    async_method = getattr(store, f"{method_name}_async", None)
+    if async_method is not None:
+        return await async_method(*args, **kwargs)
+    return getattr(store, method_name)(*args, **kwargs)
+
+
 @router.get("/{job_id}/stats")
 async def get_graph_stats(
     job_id: str,
     _: dict[str, Any] = Depends(require_job_access_user),
 ):
-    return get_graph_store().get_stats(job_id)
+    return await _call_store("get_stats", job_id)
 
 
 @router.get("/{job_id}/neighbors/{global_id}")
@@ -33,7 +42,7 @@ async def get_graph_neighbors(
     global_id: str,
     _: dict[str, Any] = Depends(require_job_access_user),
 ):
-    return get_graph_store().get_neighbors(job_id, global_id)
+    return await _call_store("get_neighbors", job_id, global_id)
 
 
 @router.get("/{job_id}/path/{source_id}/{target_id}")
@@ -43,7 +52,7 @@ async def get_graph_path(
     target_id: str,
     _: dict[str, Any] = Depends(require_job_access_user),
 ):
-    return get_graph_store().get_path(job_id, source_id, target_id)
+    return await _call_store("get_path", job_id, source_id, target_id)
 
 
 @router.post("/{job_id}/query")
@@ -52,7 +61,7 @@ async def query_graph(
     query: GraphQuery,
     _: dict[str, Any] = Depends(require_job_access_user),
 ):
-    return get_graph_store().query(job_id, query)
+    return await _call_store("query", job_id, query)
 
 
 @router.get("/{job_id}/subgraph")
@@ -80,7 +89,7 @@ async def get_graph_subgraph(
         limit=limit,
         offset=offset,
     )
-    return get_graph_store().subgraph(job_id, query)
+    return await _call_store("subgraph", job_id, query)
 
 
 @router.get("/{job_id}/properties/{global_id}")
@@ -91,11 +100,9 @@ async def get_element_properties(
     _: dict[str, Any] = Depends(require_job_access_user),
 ):
     """Return property sets attached to a single element."""
-    store = get_graph_store()
-    method = getattr(store, "get_element_properties", None)
-    if not method:
+    if not hasattr(get_graph_store(), "get_element_properties"):
         return {"properties": [], "note": "Property queries not supported by current graph backend."}
-    return {"properties": method(job_id, global_id, pset_name=pset_name)}
+    return {"properties": await _call_store("get_element_properties", job_id, global_id, pset_name=pset_name)}
 
 
 @router.get("/{job_id}/property-stats")
@@ -104,8 +111,6 @@ async def get_property_stats(
     _: dict[str, Any] = Depends(require_job_access_user),
 ):
     """Return aggregate property counts for the model."""
-    store = get_graph_store()
-    method = getattr(store, "get_property_stats", None)
-    if not method:
+    if not hasattr(get_graph_store(), "get_property_stats"):
         return {"total_properties": 0, "note": "Property queries not supported by current graph backend."}
-    return method(job_id)
+    return await _call_store("get_property_stats", job_id)
@@ -14,23 +14,45 @@ Phase 5:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from threading import Lock
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator, Sequence
 
 from fastapi import HTTPException
 
-from config import NEO4J_DATABASE, NEO4J_INGEST_BATCH_SIZE
-from neo4j_client import get_neo4j_driver
+from config import (
+    NEO4J_DATABASE,
+    NEO4J_INGEST_BATCH_SIZE,
+    NEO4J_MAX_CONCURRENCY,
+    NEO4J_TRAVERSAL_TIMEOUT,
+)
+from neo4j_client import READ_ACCESS, Query, get_neo4j_driver
 from utils import clean_text as _clean_text
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _schema_initialized = False
 _schema_lock = Lock()
 _GRAPH_NOT_BUILT_MESSAGE = "Graph not built for this job. Re-process to enable."
+_EXISTS_CACHE_TTL_SECONDS = 30.0
+# Upper bound on the id list sent as one get_existing_node_ids parameter.
+_EXISTING_IDS_CHUNK_SIZE = 10_000
 
 _SCHEMA_QUERIES = (
     """
@@ -76,6 +98,18 @@ _SCHEMA_QUERIES = (
     """,
 )
 
+# Names created by _SCHEMA_QUERIES; when all exist the DDL is skipped.
+_EXPECTED_CONSTRAINTS = frozenset({"bim_node_job_id_unique", "bim_rel_job_key_unique", "bim_prop_job_id_unique"})
+_EXPECTED_INDEXES = frozenset(
+    {
+        "bim_node_job_ifc_type",
+        "bim_node_job_storey",
+        "bim_rel_job_type",
+        "bim_prop_job_propname",
+        "bim_prop_job_psetname",
+    }
+)
+
 _DELETE_JOB_GRAPH_CYPHER = """
 MATCH (n:BIMNode {job_id: $job_id})
 DETACH DELETE n
@@ -94,13 +128,15 @@ SET n.globalId = row.globalId,
     n.ifcType = row.ifcType,
     n.name = row.name,
     n.storey = row.storey,
-    n.materials = row.materials
+    n.materials = [m IN coalesce(row.materials, []) WHERE m IS NOT NULL AND trim(m) <> '' | trim(m)]
 """
 
 _UPSERT_EDGES_CYPHER = """
 UNWIND $rows AS row
 MATCH (source:BIMNode {job_id: $job_id, id: row.source})
+USING INDEX source:BIMNode(job_id, id)
 MATCH (target:BIMNode {job_id: $job_id, id: row.target})
+USING INDEX target:BIMNode(job_id, id)
 MERGE (source)-[r:BIM_REL {job_id: $job_id, edge_key: row.edge_key}]->(target)
 SET r.type = row.type,
     r.source = row.source,
@@ -125,12 +161,176 @@ MATCH (prop:BIMProp  {job_id: $job_id, id: row.id})
 MERGE (parent)-[r:HAS_PROP {job_id: $job_id, edge_key: row.edge_key}]->(prop)
 """
 
+_GRAPH_STATS_CYPHER = """
+MATCH (n:BIMNode {job_id: $job_id})
+WITH count(n) AS node_count
+CALL {
+    MATCH ()-[r:BIM_REL {job_id: $job_id}]->()
+    RETURN count(r) AS edge_count
+}
+CALL {
+    MATCH (n:BIMNode {job_id: $job_id})
+    WITH coalesce(n.ifcType, 'Unknown') AS value, count(*) AS count
+    RETURN collect({value: value, count: count}) AS node_types
+}
+CALL {
+    MATCH ()-[r:BIM_REL {job_id: $job_id}]->()
+    WITH coalesce(r.type, 'RELATED_TO') AS value, count(*) AS count
+    RETURN collect({value: value, count: count}) AS edge_types
+}
+CALL {
+    MATCH (n:BIMNode {job_id: $job_id})
+    WHERE n.storey IS NOT NULL
+    RETURN collect(DISTINCT n.storey) AS storeys
+}
+CALL {
+    MATCH (n:BIMNode {job_id: $job_id})
+    UNWIND coalesce(n.materials, []) AS mat
+    RETURN collect(DISTINCT mat) AS materials
+}
+RETURN node_count, edge_count, node_types, edge_types, storeys, materials
+"""
+
+_APOC_AVAILABLE_CYPHER = """
+SHOW PROCEDURES YIELD name
+WHERE name = 'apoc.periodic.iterate'
+RETURN count(*) AS count
+"""
+
+_APOC_ITERATE_CYPHER = """
+CALL apoc.periodic.iterate(
+    'UNWIND $rows AS row RETURN row',
+    $action,
+    {
+        batchSize: $batch_size,
+        parallel: $parallel,
+        concurrency: $concurrency,
+        params: {rows: $rows, job_id: $job_id}
+    }
+)
+YIELD failedBatches, errorMessages
+RETURN failedBatches, errorMessages
+"""
+
+# Shared by the _query_impl node queries; `n` is the candidate node.
+_NODE_FILTER_PREDICATES = """
+    ($node_type IS NULL OR toLower(coalesce(n.ifcType, '')) = toLower($node_type))
+    AND ($storey IS NULL OR toLower(coalesce(n.storey, '')) = toLower($storey))
+    AND ($name_contains IS NULL OR toLower(coalesce(n.name, '')) CONTAINS toLower($name_contains))
+    AND ($material IS NULL OR any(m IN coalesce(n.materials, []) WHERE toLower(toString(m)) = toLower($material)))
+    AND (($prop_name IS NULL AND $prop_value IS NULL) OR EXISTS {
+        MATCH (n)-[:HAS_PROP]->(p:BIMProp {job_id: $job_id})
+        WHERE ($prop_name IS NULL OR toLower(p.propName) CONTAINS toLower($prop_name))
+          AND ($prop_value IS NULL OR toLower(p.value) CONTAINS toLower($prop_value))
+    })
+"""
+
+# Sorts, counts and pages the filtered `n` rows server-side so only one page
+# crosses Bolt. Sort order mirrors _node_sort_key; the value list order must
+# match _NODE_KEYS.
+_NODE_PAGE_RETURN = """
+    WITH n
+    ORDER BY toLower(trim(coalesce(n.name, ''))), toLower(trim(coalesce(n.ifcType, ''))), n.id
+    WITH collect([n.id, n.globalId, n.label, n.ifcType, n.name, n.storey, n.materials]) AS matched
+    RETURN size(matched) AS total, matched[$offset..$offset + $limit] AS rows
+"""
+
+_NODE_KEYS = ("id", "globalId", "label", "ifcType", "name", "storey", "materials")
+_get_node_cols = itemgetter(*_NODE_KEYS)
+
+_apoc_available: bool | None = None
 
-def _iter_batches(rows: list[dict[str, Any]], batch_size: int) -> Iterable[list[dict[str, Any]]]:
+
+def _iter_batches(rows: list[Any], batch_size: int) -> Iterable[list[Any]]:
     for start in range(0, len(rows), batch_size):
         yield rows[start : start + batch_size]
 
 
+def _run_write(tx: Any, query: str, **params: Any) -> None:
+    # Upserts/deletes return no records; the transaction drains the result on
+    # commit, so skip materializing a ResultSummary per batch.
+    tx.run(query, **params)
+
+
+def _upsert_batches(driver: Any, query: str, job_id: str, rows: list[dict[str, Any]], *, parallel: bool) -> None:
+    """
+    Run UNWIND upsert batches on up to NEO4J_MAX_CONCURRENCY sessions at once,
+    or one after another when parallel is False.
+    """
+    batches = list(_iter_batches(rows, NEO4J_INGEST_BATCH_SIZE))
+
+    def _write(batch: list[dict[str, Any]]) -> None:
+        with driver.session(database=NEO4J_DATABASE) as session:
+            session.execute_write(_run_write, query, job_id=job_id, rows=batch)
+
+    # Relationship phases run serially: their batches lock shared endpoint nodes
+    if not parallel or len(batches) <= 1 or NEO4J_MAX_CONCURRENCY <= 1:
+        for batch in batches:
+            _write(batch)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(NEO4J_MAX_CONCURRENCY, len(batches))) as executor:
+        futures = [executor.submit(_write, batch) for batch in batches]
+        for future in futures:
+            future.result()
+
+
+def _apoc_iterate_available(driver: Any) -> bool:
+    global _apoc_available
+    if _apoc_available is None:
+        try:
+            with driver.session(database=NEO4J_DATABASE) as session:
+                record = session.run(_APOC_AVAILABLE_CYPHER).single()
+            _apoc_available = bool(record and record["count"])
+        except Exception as exc:
+            logger.info("APOC availability probe failed; using client-side batching: %s", exc)
+            _apoc_available = False
+    return _apoc_available
+
+
+def _upsert_rows(driver: Any, query: str, job_id: str, rows: list[dict[str, Any]], *, parallel: bool) -> None:
+    """
+    Upsert rows with one apoc.periodic.iterate call when APOC is installed,
+    otherwise fall back to client-side UNWIND batches.
+    """
+    if not rows:
+        return
+    if not _apoc_iterate_available(driver):
+        _upsert_batches(driver, query, job_id, rows, parallel=parallel)
+        return
+
+    # apoc.periodic.iterate binds each row itself, so drop the UNWIND header.
+    action = query.replace("UNWIND $rows AS row", "", 1)
+    with driver.session(database=NEO4J_DATABASE) as session:
+        record = session.run(
+            _APOC_ITERATE_CYPHER,
+            action=action,
+            batch_size=NEO4J_INGEST_BATCH_SIZE,
+            parallel=parallel,
+            concurrency=NEO4J_MAX_CONCURRENCY,
+            rows=rows,
+            job_id=job_id,
+        ).single()
+    if record and record["failedBatches"]:
+        raise RuntimeError(f"apoc.periodic.iterate failed batches: {record['errorMessages']}")
+
+
+def _create_schema(tx: Any) -> None:
+    for query in _SCHEMA_QUERIES:
+        tx.run(query).consume()
+
+
+def _schema_present(session: Any) -> bool:
+    try:
+        constraints = set(session.run("SHOW CONSTRAINTS YIELD name").value())
+        indexes = set(session.run("SHOW INDEXES YIELD name").value())
+    except Exception as exc:
+        # Older servers without SHOW ... YIELD; fall through to the idempotent DDL.
+        logger.info("Neo4j schema probe failed; creating schema: %s", exc)
+        return False
+    return _EXPECTED_CONSTRAINTS <= constraints and _EXPECTED_INDEXES <= indexes
+
+
 def _ensure_schema() -> bool:
     global _schema_initialized
     if _schema_initialized:
@@ -145,8 +345,8 @@ def _ensure_schema() -> bool:
             return True
         try:
             with driver.session(database=NEO4J_DATABASE) as session:
-                for query in _SCHEMA_QUERIES:
-                    session.execute_write(lambda tx, q=query: tx.run(q).consume())
+                if not _schema_present(session):
+                    session.execute_write(_create_schema)
             _schema_initialized = True
             logger.info("Neo4j BIM graph schema ensured.")
             return True
@@ -160,13 +360,12 @@ def _normalize_node(raw_node: dict[str, Any]) -> dict[str, Any] | None:
     if not node_id:
         return None
 
-    materials_raw = raw_node.get("materials") or []
-    materials = []
-    if isinstance(materials_raw, list):
-        for value in materials_raw:
-            text = _clean_text(value)
-            if text:
-                materials.append(text)
+    materials_raw = raw_node.get("materials")
+    materials = (
+        [text for value in materials_raw if (text := _clean_text(value))]
+        if isinstance(materials_raw, list)
+        else []
+    )
 
     return {
         "id": node_id,
@@ -179,37 +378,72 @@ def _normalize_node(raw_node: dict[str, Any]) -> dict[str, Any] | None:
     }
 
 
-def _normalize_edge(raw_edge: dict[str, Any]) -> dict[str, Any] | None:
-    source = _clean_text(raw_edge.get("source"))
-    target = _clean_text(raw_edge.get("target"))
-    if not source or not target:
-        return None
-    edge_type = _clean_text(raw_edge.get("type")) or "RELATED_TO"
-    return {
-        "source": source,
-        "target": target,
-        "type": edge_type,
-        "edge_key": f"{source}|{edge_type}|{target}",
-    }
+def _stream_graph_items(graph_path: Path, prefix: str) -> Iterator[Any]:
+    with open(graph_path, "rb") as handle:
+        yield from ijson.items(handle, f"{prefix}.item", use_float=True)
+
+
+def _stream_graph_edges(graph_path: Path) -> Iterator[Any]:
+    found = False
+    for item in _stream_graph_items(graph_path, "links"):
+        found = True
+        yield item
+    if not found:
+        yield from _stream_graph_items(graph_path, "edges")
+
+
+def _read_graph_items(graph_path: Path) -> tuple[Iterable[Any] | None, Iterable[Any] | None]:
+    """
+    Return (raw_nodes, raw_edges) iterables for a node-link graph.json.
+    With ijson installed items are streamed, so the raw payload is never held
+    in memory as a whole; otherwise the file is parsed in one go (orjson when
+    available, else json.load).
+    """
+    if ijson is not None:
+        return _stream_graph_items(graph_path, "nodes"), _stream_graph_edges(graph_path)
+
+    if orjson is not None:
+        payload = orjson.loads(graph_path.read_bytes())
+    else:
+        with open(graph_path, "r", encoding="utf-8") as handle:
+            payload = json.load(handle)
+    if not isinstance(payload, dict):
+        return None, None
+    raw_nodes = payload.get("nodes")
+    edge_key = "links" if "links" in payload else "edges"
+    raw_edges = payload.get(edge_key)
+    return (
+        raw_nodes if isinstance(raw_nodes, list) else None,
+        raw_edges if isinstance(raw_edges, list) else None,
+    )
 
 
 def _load_graph_rows(graph_json_path: str | Path) -> tuple[
     list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]
 ]:
     """Return (element_nodes, edges, property_rows) from graph.json."""
-    graph_path = Path(graph_json_path)
-    with open(graph_path, "r", encoding="utf-8") as handle:
-        payload = json.load(handle)
-
-    raw_nodes = payload.get("nodes") if isinstance(payload, dict) else []
-    edge_key = "links" if isinstance(payload, dict) and "links" in payload else "edges"
-    raw_edges = payload.get(edge_key) if isinstance(payload, dict) else []
+    raw_nodes, raw_edges = _read_graph_items(Path(graph_json_path))
 
     nodes: list[dict[str, Any]] = []
     edges: list[dict[str, Any]] = []
     prop_rows: list[dict[str, Any]] = []
 
-    if isinstance(raw_nodes, list):
+    # Pset/prop names and value types repeat across almost every element, so
+    # clean each distinct raw value once and reuse the (interned) result.
+    pset_cache: dict[Any, str] = {}
+    prop_cache: dict[Any, str] = {}
+    vt_cache: dict[Any, str] = {}
+
+    def _cached_clean(cache: dict[Any, str], raw_value: Any, default: str) -> str:
+        try:
+            return cache[raw_value]
+        except KeyError:
+            text = cache[raw_value] = _clean_text(raw_value) or default
+            return text
+        except TypeError:
+            return _clean_text(raw_value) or default
+
+    if raw_nodes is not None:
         for raw in raw_nodes:
             if not isinstance(raw, dict):
                 continue
@@ -227,10 +461,10 @@ def _load_graph_rows(graph_json_path: str | Path) -> tuple[
                 prop_rows.append({
                     "id": prop_id,
                     "globalId": prop_id,
-                    "psetName": _clean_text(raw.get("psetName")) or "",
-                    "propName": _clean_text(raw.get("propName")) or "",
+                    "psetName": _cached_clean(pset_cache, raw.get("psetName"), ""),
+                    "propName": _cached_clean(prop_cache, raw.get("propName"), ""),
                     "value": _clean_text(raw.get("value")) or "",
-                    "valueType": _clean_text(raw.get("valueType")) or "string",
+                    "valueType": _cached_clean(vt_cache, raw.get("valueType"), "string"),
                     "parentId": parent_id,
                     "edge_key": f"{parent_id}|HAS_PROP|{prop_id}",
                 })
@@ -239,16 +473,16 @@ def _load_graph_rows(graph_json_path: str | Path) -> tuple[
                 if normalized:
                     nodes.append(normalized)
 
-    if isinstance(raw_edges, list):
-        for raw in raw_edges:
-            if not isinstance(raw, dict):
-                continue
-            # Skip HAS_PROPERTY edges (handled via prop_rows above)
-            if _clean_text(raw.get("type")) == "HAS_PROPERTY":
-                continue
-            normalized = _normalize_edge(raw)
-            if normalized:
-                edges.append(normalized)
+    if raw_edges is not None:
+        # Single pass; HAS_PROPERTY edges are skipped (handled via prop_rows above).
+        edges = [
+            {"source": source, "target": target, "type": edge_type, "edge_key": f"{source}|{edge_type}|{target}"}
+            for raw in raw_edges
+            if isinstance(raw, dict)
+            and (edge_type := _clean_text(raw.get("type")) or "RELATED_TO") != "HAS_PROPERTY"
+            and (source := _clean_text(raw.get("source")))
+            and (target := _clean_text(raw.get("target")))
+        ]
 
     return nodes, edges, prop_rows
 
@@ -266,31 +500,22 @@ def sync_graph_json_to_neo4j(job_id: str, graph_json_path: str | Path) -> dict[s
         return {"enabled": True, "nodes": 0, "edges": 0, "error": "schema_init_failed"}
 
     nodes, edges, prop_rows = _load_graph_rows(graph_json_path)
+    # Source-major order keeps each batch's MATCH lookups on neighbouring index pages.
+    edges.sort(key=lambda edge: (edge["source"], edge["target"]))
 
     try:
         with driver.session(database=NEO4J_DATABASE) as session:
-            session.execute_write(lambda tx: tx.run(_DELETE_JOB_PROPS_CYPHER, job_id=job_id).consume())
-            session.execute_write(lambda tx: tx.run(_DELETE_JOB_GRAPH_CYPHER, job_id=job_id).consume())
-
-            for batch in _iter_batches(nodes, NEO4J_INGEST_BATCH_SIZE):
-                session.execute_write(
-                    lambda tx, rows=batch: tx.run(_UPSERT_NODES_CYPHER, job_id=job_id, rows=rows).consume()
-                )
+            session.execute_write(_run_write, _DELETE_JOB_PROPS_CYPHER, job_id=job_id)
+            session.execute_write(_run_write, _DELETE_JOB_GRAPH_CYPHER, job_id=job_id)
 
-            for batch in _iter_batches(edges, NEO4J_INGEST_BATCH_SIZE):
-                session.execute_write(
-                    lambda tx, rows=batch: tx.run(_UPSERT_EDGES_CYPHER, job_id=job_id, rows=rows).consume()
-                )
+        # Each phase finishes before the next so edges only MATCH existing nodes.
+        # Relationship phases run serially server-side to avoid endpoint lock contention.
+        _upsert_rows(driver, _UPSERT_NODES_CYPHER, job_id, nodes, parallel=True)
+        _upsert_rows(driver, _UPSERT_EDGES_CYPHER, job_id, edges, parallel=False)
 
-            # Property nodes + edges
-            for batch in _iter_batches(prop_rows, NEO4J_INGEST_BATCH_SIZE):
-                session.execute_write(
-                    lambda tx, rows=batch: tx.run(_UPSERT_PROPS_CYPHER, job_id=job_id, rows=rows).consume()
-                )
-            for batch in _iter_batches(prop_rows, NEO4J_INGEST_BATCH_SIZE):
-                session.execute_write(
-                    lambda tx, rows=batch: tx.run(_UPSERT_PROP_EDGES_CYPHER, job_id=job_id, rows=rows).consume()
-                )
+        # Property nodes + edges
+        _upsert_rows(driver, _UPSERT_PROPS_CYPHER, job_id, prop_rows, parallel=True)
+        _upsert_rows(driver, _UPSERT_PROP_EDGES_CYPHER, job_id, prop_rows, parallel=False)
     except Exception as exc:
         logger.warning("[%s] Neo4j graph sync failed: %s", job_id, exc)
         return {"enabled": True, "nodes": 0, "edges": 0, "error": str(exc)}
@@ -305,8 +530,8 @@ def delete_job_graph_from_neo4j(job_id: str) -> bool:
         return False
     try:
         with driver.session(database=NEO4J_DATABASE) as session:
-            session.execute_write(lambda tx: tx.run(_DELETE_JOB_PROPS_CYPHER, job_id=job_id).consume())
-            session.execute_write(lambda tx: tx.run(_DELETE_JOB_GRAPH_CYPHER, job_id=job_id).consume())
+            session.execute_write(_run_write, _DELETE_JOB_PROPS_CYPHER, job_id=job_id)
+            session.execute_write(_run_write, _DELETE_JOB_GRAPH_CYPHER, job_id=job_id)
         return True
     except Exception as exc:
         logger.warning("[%s] Failed to delete Neo4j graph data: %s", job_id, exc)
@@ -314,24 +539,33 @@ def delete_job_graph_from_neo4j(job_id: str) -> bool:
 
 
 def _node_payload(row: dict[str, Any]) -> dict[str, Any]:
-    materials_raw = row.get("materials") or []
-    materials: list[str] = []
-    if isinstance(materials_raw, list):
-        for value in materials_raw:
-            text = _clean_text(value)
-            if text:
-                materials.append(text)
+    # Rows come from map projections that always carry every _NODE_KEYS entry.
+    return _node_payload_from_values(_get_node_cols(row))
+
+
+def _node_payload_from_values(values: Sequence[Any]) -> dict[str, Any]:
+    """Build a node payload from values in _NODE_KEYS order."""
+    node_id, global_id, label, ifc_type, name, storey, materials = values
     return {
-        "id": str(row.get("id") or ""),
-        "globalId": str(row.get("globalId") or row.get("id") or ""),
-        "label": row.get("label"),
-        "ifcType": row.get("ifcType"),
-        "name": row.get("name"),
-        "storey": row.get("storey"),
-        "materials": materials,
+        "id": str(node_id or ""),
+        "globalId": str(global_id or node_id or ""),
+        "label": label,
+        "ifcType": ifc_type,
+        "name": name,
+        "storey": storey,
+        # Materials are trimmed and filtered at write time (_UPSERT_NODES_CYPHER),
+        # so reads can pass them through without re-cleaning.
+        "materials": materials or [],
     }
 
 
+def _traversal_query(text: str) -> Any:
+    """Wrap a variable-length/shortestPath query with the server-side traversal timeout."""
+    if Query is None:
+        return text
+    return Query(text, timeout=NEO4J_TRAVERSAL_TIMEOUT)
+
+
 def _node_sort_key(node: dict[str, Any]) -> tuple[str, str, str]:
     return (
         _clean_text(node.get("name")).lower(),
@@ -340,51 +574,62 @@ def _node_sort_key(node: dict[str, Any]) -> tuple[str, str, str]:
     )
 
 
-def _dedupe_edges(edges: list[dict[str, Any]]) -> list[dict[str, Any]]:
-    seen: set[tuple[str, str, str]] = set()
-    result: list[dict[str, Any]] = []
-    for edge in edges:
-        source = str(edge.get("source") or "")
-        target = str(edge.get("target") or "")
-        edge_type = _clean_text(edge.get("type")) or "RELATED_TO"
-        key = (source, target, edge_type)
-        if key in seen:
-            continue
-        seen.add(key)
-        result.append({"source": source, "target": target, "type": edge_type})
-    return result
-
-
 class Neo4jGraphStore:
     def __init__(self) -> None:
-        pass
+        # job_id -> monotonic time the graph was last seen non-empty.
+        self._exists_cache: dict[str, float] = {}
 
     def invalidate_cache(self, job_id: str) -> None:
-        return None
+        self._exists_cache.pop(job_id, None)
 
-    def _execute_read(self, query: str, **params: Any) -> list[dict[str, Any]]:
+    def _mark_job_graph_exists(self, job_id: str) -> None:
+        self._exists_cache[job_id] = time.monotonic()
+
+    def _read_session(self) -> Any:
+        """Open one session to be shared by every read of a public call."""
         driver = get_neo4j_driver()
         if not driver:
             raise HTTPException(status_code=500, detail="Neo4j driver is not available.")
-        with driver.session(database=NEO4J_DATABASE) as session:
-            result = session.run(query, **params)
-            return [record.data() for record in result]
+        # Every store read is read-only, so let cluster routing send it to a reader.
+        return driver.session(database=NEO4J_DATABASE, default_access_mode=READ_ACCESS)
+
+    def _execute_read(self, session: Any, query: Any, **params: Any) -> list[dict[str, Any]]:
+        result = session.run(query, **params)
+        return [record.data() for record in result]
+
+    def _execute_read_values(self, session: Any, query: Any, **params: Any) -> list[Sequence[Any]]:
+        """Like _execute_read, but keep records as positional tuples (no per-row dict)."""
+        return list(session.run(query, **params))
 
-    def _job_node_count(self, job_id: str) -> int:
-        rows = self._execute_read(
+    def _execute_scalar(self, session: Any, query: Any, **params: Any) -> Any:
+        """Return the first column of the first record, or None when there is no row."""
+        record = session.run(query, **params).single()
+        return record.value() if record is not None else None
+
+    def _execute_column(self, session: Any, query: Any, **params: Any) -> list[Any]:
+        """Return the first column of every record."""
+        return session.run(query, **params).value()
+
+    def _job_node_count(self, session: Any, job_id: str) -> int:
+        count = self._execute_scalar(
+            session,
             "MATCH (n:BIMNode {job_id: $job_id}) RETURN count(n) AS count",
             job_id=job_id,
         )
-        if not rows:
-            return 0
-        return int(rows[0].get("count") or 0)
-
-    def _ensure_job_graph_exists(self, job_id: str) -> None:
-        if self._job_node_count(job_id) == 0:
+        return int(count or 0)
+
+    def _ensure_job_graph_exists(self, session: Any, job_id: str) -> None:
+        seen_at = self._exists_cache.get(job_id)
+        if seen_at is not None and time.monotonic() - seen_at < _EXISTS_CACHE_TTL_SECONDS:
+            return
+        if self._job_node_count(session, job_id) == 0:
+            self._exists_cache.pop(job_id, None)
             raise HTTPException(status_code=404, detail=_GRAPH_NOT_BUILT_MESSAGE)
+        self._mark_job_graph_exists(job_id)
 
-    def _get_node_by_id(self, job_id: str, node_id: str) -> dict[str, Any] | None:
-        rows = self._execute_read(
+    def _get_node_by_id(self, session: Any, job_id: str, node_id: str) -> dict[str, Any] | None:
+        rows = self._execute_read_values(
+            session,
             """
             MATCH (n:BIMNode {job_id: $job_id, id: $node_id})
             RETURN n.id AS id,
@@ -401,82 +646,43 @@ class Neo4jGraphStore:
         )
         if not rows:
             return None
-        return _node_payload(rows[0])
+        return _node_payload_from_values(rows[0])
 
     def get_stats(self, job_id: str) -> dict[str, Any]:
-        self._ensure_job_graph_exists(job_id)
-
-        node_count_rows = self._execute_read(
-            "MATCH (n:BIMNode {job_id: $job_id}) RETURN count(n) AS count",
-            job_id=job_id,
-        )
-        edge_count_rows = self._execute_read(
-            "MATCH ()-[r:BIM_REL {job_id: $job_id}]->() RETURN count(r) AS count",
-            job_id=job_id,
-        )
-        node_type_rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id})
-            RETURN coalesce(n.ifcType, 'Unknown') AS value, count(*) AS count
-            """,
-            job_id=job_id,
-        )
-        edge_type_rows = self._execute_read(
-            """
-            MATCH ()-[r:BIM_REL {job_id: $job_id}]->()
-            RETURN coalesce(r.type, 'RELATED_TO') AS value, count(*) AS count
-            """,
-            job_id=job_id,
-        )
-        storey_rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id})
-            WHERE n.storey IS NOT NULL
-            RETURN DISTINCT n.storey AS value
-            """,
-            job_id=job_id,
-        )
-        material_rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id})
-            UNWIND coalesce(n.materials, []) AS mat
-            RETURN DISTINCT mat AS value
-            """,
-            job_id=job_id,
-        )
+        with self._read_session() as session:
+            # One round trip; node_count doubles as the job-exists probe.
+            rows = self._execute_read(session, _GRAPH_STATS_CYPHER, job_id=job_id)
+        row = rows[0] if rows else {}
+        node_count = int(row.get("node_count") or 0)
+        if node_count == 0:
+            self._exists_cache.pop(job_id, None)
+            raise HTTPException(status_code=404, detail=_GRAPH_NOT_BUILT_MESSAGE)
+        self._mark_job_graph_exists(job_id)
 
         node_types: dict[str, int] = {}
-        for row in node_type_rows:
-            key = _clean_text(row.get("value")) or "Unknown"
-            node_types[key] = int(row.get("count") or 0)
+        for item in row.get("node_types") or []:
+            key = _clean_text(item.get("value")) or "Unknown"
+            node_types[key] = int(item.get("count") or 0)
 
         edge_types: dict[str, int] = {}
-        for row in edge_type_rows:
-            key = _clean_text(row.get("value")) or "RELATED_TO"
-            edge_types[key] = int(row.get("count") or 0)
+        for item in row.get("edge_types") or []:
+            key = _clean_text(item.get("value")) or "RELATED_TO"
+            edge_types[key] = int(item.get("count") or 0)
 
         storeys = sorted(
-            {
-                text
-                for row in storey_rows
-                if (text := _clean_text(row.get("value")))
-            },
+            {text for value in row.get("storeys") or [] if (text := _clean_text(value))},
             key=lambda value: value.lower(),
         )
 
         materials = sorted(
-            {
-                text
-                for row in material_rows
-                if (text := _clean_text(row.get("value")))
-            },
+            {text for value in row.get("materials") or [] if (text := _clean_text(value))},
             key=lambda value: value.lower(),
         )
 
         return {
             "job_id": job_id,
-            "node_count": int((node_count_rows[0] if node_count_rows else {}).get("count") or 0),
-            "edge_count": int((edge_count_rows[0] if edge_count_rows else {}).get("count") or 0),
+            "node_count": node_count,
+            "edge_count": int(row.get("edge_count") or 0),
             "node_types": dict(sorted(node_types.items(), key=lambda item: item[0].lower())),
             "edge_types": dict(sorted(edge_types.items(), key=lambda item: item[0].lower())),
             "storeys": storeys,
@@ -484,295 +690,283 @@ class Neo4jGraphStore:
         }
 
     def get_neighbors(self, job_id: str, global_id: str) -> dict[str, Any]:
-        self._ensure_job_graph_exists(job_id)
-
-        node_id = _clean_text(global_id)
-        center_node = self._get_node_by_id(job_id, node_id)
-        if not center_node:
-            raise HTTPException(status_code=404, detail=f"Node not found in graph: {node_id}")
+        with self._read_session() as session:
+            self._ensure_job_graph_exists(session, job_id)
 
-        edge_rows = self._execute_read(
-            """
-            MATCH (a:BIMNode {job_id: $job_id})-[r:BIM_REL {job_id: $job_id}]-(b:BIMNode {job_id: $job_id})
-            WHERE a.id = $node_id OR b.id = $node_id
-            RETURN DISTINCT startNode(r).id AS source,
-                            endNode(r).id AS target,
-                            coalesce(r.type, 'RELATED_TO') AS type
-            """,
-            job_id=job_id,
-            node_id=node_id,
-        )
-        edges_payload = _dedupe_edges(edge_rows)
+            node_id = _clean_text(global_id)
+            # Center node, incident edges and neighbor nodes in one round trip.
+            rows = self._execute_read(
+                session,
+                """
+                MATCH (a:BIMNode {job_id: $job_id, id: $node_id})
+                OPTIONAL MATCH (a)-[r:BIM_REL {job_id: $job_id}]-(b:BIMNode {job_id: $job_id})
+                WITH a, collect(DISTINCT r) AS rels, collect(DISTINCT b) AS nbrs
+                RETURN [n IN [a] + nbrs | n {.id, .globalId, .label, .ifcType, .name, .storey, .materials}] AS nodes,
+                       [rel IN rels | {
+                           source: startNode(rel).id,
+                           target: endNode(rel).id,
+                           type: coalesce(rel.type, 'RELATED_TO')
+                       }] AS edges
+                """,
+                job_id=job_id,
+                node_id=node_id,
+            )
+            if not rows:
+                raise HTTPException(status_code=404, detail=f"Node not found in graph: {node_id}")
 
-        neighbor_ids = {node_id}
-        for edge in edges_payload:
-            neighbor_ids.add(str(edge["source"]))
-            neighbor_ids.add(str(edge["target"]))
+            # collect(DISTINCT r) plus the (job_id, edge_key) constraint already
+            # guarantee one entry per (source, type, target).
+            edges_payload = rows[0].get("edges") or []
 
-        node_rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id})
-            WHERE n.id IN $node_ids
-            RETURN n.id AS id,
-                   n.globalId AS globalId,
-                   n.label AS label,
-                   n.ifcType AS ifcType,
-                   n.name AS name,
-                   n.storey AS storey,
-                   n.materials AS materials
-            """,
-            job_id=job_id,
-            node_ids=list(neighbor_ids),
-        )
-        node_map = {str(row.get("id")): _node_payload(row) for row in node_rows}
+            neighbor_ids = {node_id}
+            for edge in edges_payload:
+                neighbor_ids.add(str(edge["source"]))
+                neighbor_ids.add(str(edge["target"]))
 
-        ordered_neighbor_ids = sorted(
-            [nid for nid in neighbor_ids if nid != node_id],
-            key=lambda nid: _node_sort_key(node_map.get(nid, {"id": nid})),
-        )
-        ordered_ids = [node_id] + ordered_neighbor_ids
-        nodes_payload = [node_map[nid] for nid in ordered_ids if nid in node_map]
+            node_map = {str(row.get("id")): _node_payload(row) for row in rows[0].get("nodes") or []}
 
-        return {
-            "nodes": nodes_payload,
-            "edges": edges_payload,
-            "total": len(nodes_payload),
-            "center": node_id,
-        }
+            ordered_neighbor_ids = sorted(
+                [nid for nid in neighbor_ids if nid != node_id],
+                key=lambda nid: _node_sort_key(node_map.get(nid, {"id": nid})),
+            )
+            ordered_ids = [node_id] + ordered_neighbor_ids
+            nodes_payload = [node_map[nid] for nid in ordered_ids if nid in node_map]
+
+            return {
+                "nodes": nodes_payload,
+                "edges": edges_payload,
+                "total": len(nodes_payload),
+                "center": node_id,
+            }
 
     def get_path(self, job_id: str, source_id: str, target_id: str) -> dict[str, Any]:
-        self._ensure_job_graph_exists(job_id)
-
-        source = _clean_text(source_id)
-        target = _clean_text(target_id)
-
-        if not self._get_node_by_id(job_id, source):
-            raise HTTPException(status_code=404, detail=f"Node not found in graph: {source}")
-        if not self._get_node_by_id(job_id, target):
-            raise HTTPException(status_code=404, detail=f"Node not found in graph: {target}")
-
-        path_rows = self._execute_read(
-            """
-            MATCH (source:BIMNode {job_id: $job_id, id: $source_id})
-            MATCH (target:BIMNode {job_id: $job_id, id: $target_id})
-            MATCH p = shortestPath((source)-[:BIM_REL*]-(target))
-            RETURN [n IN nodes(p) | n.id] AS path_ids
-            """,
-            job_id=job_id,
-            source_id=source,
-            target_id=target,
-        )
-        if not path_rows:
-            raise HTTPException(status_code=404, detail=f"No path found between {source} and {target}")
-
-        path_ids_raw = path_rows[0].get("path_ids") or []
-        path_ids = [str(item) for item in path_ids_raw if _clean_text(item)]
-        if not path_ids:
-            raise HTTPException(status_code=404, detail=f"No path found between {source} and {target}")
+        with self._read_session() as session:
+            self._ensure_job_graph_exists(session, job_id)
+
+            source = _clean_text(source_id)
+            target = _clean_text(target_id)
+
+            if not self._get_node_by_id(session, job_id, source):
+                raise HTTPException(status_code=404, detail=f"Node not found in graph: {source}")
+            if not self._get_node_by_id(session, job_id, target):
+                raise HTTPException(status_code=404, detail=f"Node not found in graph: {target}")
+
+            path_ids_raw = self._execute_scalar(
+                session,
+                _traversal_query(
+                    """
+                    MATCH (source:BIMNode {job_id: $job_id, id: $source_id})
+                    MATCH (target:BIMNode {job_id: $job_id, id: $target_id})
+                    MATCH p = shortestPath((source)-[:BIM_REL*]-(target))
+                    RETURN [n IN nodes(p) | n.id] AS path_ids
+                    """
+                ),
+                job_id=job_id,
+                source_id=source,
+                target_id=target,
+            )
+            path_ids = [str(item) for item in path_ids_raw or [] if _clean_text(item)]
+            if not path_ids:
+                raise HTTPException(status_code=404, detail=f"No path found between {source} and {target}")
 
-        node_rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id})
-            WHERE n.id IN $path_ids
-            RETURN n.id AS id,
-                   n.globalId AS globalId,
-                   n.label AS label,
-                   n.ifcType AS ifcType,
-                   n.name AS name,
-                   n.storey AS storey,
-                   n.materials AS materials
-            """,
-            job_id=job_id,
-            path_ids=path_ids,
-        )
-        node_map = {str(row.get("id")): _node_payload(row) for row in node_rows}
-        nodes_payload = [node_map[nid] for nid in path_ids if nid in node_map]
-
-        edge_candidates: list[dict[str, Any]] = []
-        for index in range(len(path_ids) - 1):
-            left = path_ids[index]
-            right = path_ids[index + 1]
-            hop_rows = self._execute_read(
+            node_rows = self._execute_read_values(
+                session,
                 """
-                MATCH (a:BIMNode {job_id: $job_id, id: $left})-[r:BIM_REL {job_id: $job_id}]-(b:BIMNode {job_id: $job_id, id: $right})
-                RETURN startNode(r).id AS source,
-                       endNode(r).id AS target,
-                       coalesce(r.type, 'RELATED_TO') AS type
-                ORDER BY toLower(coalesce(r.type, 'RELATED_TO')) ASC
-                LIMIT 1
+                MATCH (n:BIMNode {job_id: $job_id})
+                WHERE n.id IN $path_ids
+                RETURN n.id AS id,
+                       n.globalId AS globalId,
+                       n.label AS label,
+                       n.ifcType AS ifcType,
+                       n.name AS name,
+                       n.storey AS storey,
+                       n.materials AS materials
                 """,
                 job_id=job_id,
-                left=left,
-                right=right,
+                path_ids=path_ids,
             )
-            if hop_rows:
-                edge_candidates.append(
-                    {
-                        "source": str(hop_rows[0].get("source") or ""),
-                        "target": str(hop_rows[0].get("target") or ""),
-                        "type": _clean_text(hop_rows[0].get("type")) or "RELATED_TO",
-                    }
+            node_map = {payload["id"]: payload for payload in map(_node_payload_from_values, node_rows)}
+            nodes_payload = [node_map[nid] for nid in path_ids if nid in node_map]
+
+            pairs = [
+                {"idx": index, "left": path_ids[index], "right": path_ids[index + 1]}
+                for index in range(len(path_ids) - 1)
+            ]
+            hop_rows: list[dict[str, Any]] = []
+            if pairs:
+                # All hops in one round trip; the first edge per hop by type name wins.
+                hop_rows = self._execute_read(
+                    session,
+                    """
+                    UNWIND $pairs AS pair
+                    MATCH (a:BIMNode {job_id: $job_id, id: pair.left})-[r:BIM_REL {job_id: $job_id}]-(b:BIMNode {job_id: $job_id, id: pair.right})
+                    WITH pair.idx AS idx, r
+                    ORDER BY idx, toLower(coalesce(r.type, 'RELATED_TO')) ASC
+                    WITH idx, collect(r)[0] AS r
+                    RETURN idx,
+                           startNode(r).id AS source,
+                           endNode(r).id AS target,
+                           coalesce(r.type, 'RELATED_TO') AS type
+                    ORDER BY idx
+                    """,
+                    job_id=job_id,
+                    pairs=pairs,
                 )
+            hop_rows.sort(key=lambda row: int(row.get("idx") or 0))
+            edges_payload: list[dict[str, Any]] = []
+            seen_edges: set[tuple[str, str, str]] = set()
+            for row in hop_rows:
+                key = (
+                    str(row.get("source") or ""),
+                    str(row.get("target") or ""),
+                    _clean_text(row.get("type")) or "RELATED_TO",
+                )
+                if key in seen_edges:
+                    continue
+                seen_edges.add(key)
+                edges_payload.append({"source": key[0], "target": key[1], "type": key[2]})
+            return {
+                "nodes": nodes_payload,
+                "edges": edges_payload,
+                "total": len(nodes_payload),
+                "hops": max(len(path_ids) - 1, 0),
+            }
 
-        edges_payload = _dedupe_edges(edge_candidates)
-        return {
-            "nodes": nodes_payload,
-            "edges": edges_payload,
-            "total": len(nodes_payload),
-            "hops": max(len(path_ids) - 1, 0),
-        }
-
-    def _collect_related_node_ids(
-        self,
-        job_id: str,
-        related_to: str | None,
-        relationship: str | None,
-        max_depth: int,
-    ) -> set[str]:
-        if not related_to:
-            rows = self._execute_read(
-                "MATCH (n:BIMNode {job_id: $job_id}) RETURN n.id AS id",
-                job_id=job_id,
-            )
-            return {str(row.get("id")) for row in rows if _clean_text(row.get("id"))}
-
-        related_id = _clean_text(related_to)
-        if not self._get_node_by_id(job_id, related_id):
-            raise HTTPException(status_code=404, detail=f"Node not found in graph: {related_id}")
-
-        depth = max(1, min(4, int(max_depth)))
-        rows = self._execute_read(
-            f"""
-            MATCH (start:BIMNode {{job_id: $job_id, id: $start_id}})
-            MATCH p = (start)-[r:BIM_REL*0..{depth}]-(n:BIMNode {{job_id: $job_id}})
-            WHERE $relationship IS NULL
-               OR all(rel IN relationships(p) WHERE toLower(coalesce(rel.type, '')) = toLower($relationship))
-            RETURN DISTINCT n.id AS id
-            """,
+    def _collect_related_node_ids(self, session: Any, job_id: str) -> set[str]:
+        ids = self._execute_column(
+            session,
+            "MATCH (n:BIMNode {job_id: $job_id}) RETURN n.id AS id",
             job_id=job_id,
-            start_id=related_id,
-            relationship=relationship,
         )
-        return {str(row.get("id")) for row in rows if _clean_text(row.get("id"))}
+        return {str(node_id) for node_id in ids if _clean_text(node_id)}
 
-    def _query_impl(self, job_id: str, query: Any) -> dict[str, Any]:
+    def _query_impl(self, session: Any, job_id: str, query: Any) -> dict[str, Any]:
         relationship = _clean_text(query.relationship) or None
-        property_name = _clean_text(getattr(query, "property_name", None)) or None
-        property_value = _clean_text(getattr(query, "property_value", None)) or None
-
-        related_node_ids = self._collect_related_node_ids(
-            job_id,
-            query.related_to,
-            relationship,
-            int(query.max_depth),
-        )
-        if not related_node_ids:
-            return {"nodes": [], "edges": [], "total": 0}
+        filter_params = {
+            "node_type": _clean_text(query.node_type) or None,
+            "storey": _clean_text(query.storey) or None,
+            "name_contains": _clean_text(query.name_contains) or None,
+            "material": _clean_text(query.material) or None,
+            "prop_name": _clean_text(getattr(query, "property_name", None)) or None,
+            "prop_value": _clean_text(getattr(query, "property_value", None)) or None,
+        }
+        offset = max(0, int(query.offset))
+        limit = max(1, int(query.limit))
 
-        # When filtering by property, narrow the candidate set first
-        if property_name or property_value:
-            prop_filter_rows = self._execute_read(
-                """
-                MATCH (n:BIMNode {job_id: $job_id})-[:HAS_PROP]->(p:BIMProp {job_id: $job_id})
-                WHERE n.id IN $related_ids
-                  AND ($prop_name IS NULL OR toLower(p.propName) CONTAINS toLower($prop_name))
-                  AND ($prop_value IS NULL OR toLower(p.value) CONTAINS toLower($prop_value))
-                RETURN DISTINCT n.id AS id
-                """,
+        if query.related_to:
+            related_id = _clean_text(query.related_to)
+            if not self._get_node_by_id(session, job_id, related_id):
+                raise HTTPException(status_code=404, detail=f"Node not found in graph: {related_id}")
+
+            # Traversal and node/property filters in one query; no id list round trip.
+            depth = max(1, min(4, int(query.max_depth)))
+            page_rows = self._execute_read_values(
+                session,
+                _traversal_query(
+                    f"""
+                    MATCH (start:BIMNode {{job_id: $job_id, id: $start_id}})
+                    MATCH p = (start)-[r:BIM_REL*0..{depth}]-(n:BIMNode {{job_id: $job_id}})
+                    WHERE $relationship IS NULL
+                       OR all(rel IN relationships(p) WHERE toLower(coalesce(rel.type, '')) = toLower($relationship))
+                    WITH DISTINCT n
+                    WHERE {_NODE_FILTER_PREDICATES}
+                    {_NODE_PAGE_RETURN}
+                    """
+                ),
                 job_id=job_id,
-                related_ids=list(related_node_ids),
-                prop_name=property_name,
-                prop_value=property_value,
+                start_id=related_id,
+                relationship=relationship,
+                offset=offset,
+                limit=limit,
+                **filter_params,
             )
-            prop_matched_ids = {str(row.get("id")) for row in prop_filter_rows if _clean_text(row.get("id"))}
-            related_node_ids = related_node_ids & prop_matched_ids
+        else:
+            related_node_ids = self._collect_related_node_ids(session, job_id)
             if not related_node_ids:
                 return {"nodes": [], "edges": [], "total": 0}
 
-        node_rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id})
-            WHERE n.id IN $related_ids
-              AND ($node_type IS NULL OR toLower(coalesce(n.ifcType, '')) = toLower($node_type))
-              AND ($storey IS NULL OR toLower(coalesce(n.storey, '')) = toLower($storey))
-              AND ($name_contains IS NULL OR toLower(coalesce(n.name, '')) CONTAINS toLower($name_contains))
-              AND ($material IS NULL OR any(m IN coalesce(n.materials, []) WHERE toLower(toString(m)) = toLower($material)))
-            RETURN n.id AS id,
-                   n.globalId AS globalId,
-                   n.label AS label,
-                   n.ifcType AS ifcType,
-                   n.name AS name,
-                   n.storey AS storey,
-                   n.materials AS materials
-            """,
-            job_id=job_id,
-            related_ids=list(related_node_ids),
-            node_type=_clean_text(query.node_type) or None,
-            storey=_clean_text(query.storey) or None,
-            name_contains=_clean_text(query.name_contains) or None,
-            material=_clean_text(query.material) or None,
-        )
-
-        filtered_nodes = [_node_payload(row) for row in node_rows]
-        filtered_nodes.sort(key=_node_sort_key)
-        total = len(filtered_nodes)
+            page_rows = self._execute_read_values(
+                session,
+                f"""
+                MATCH (n:BIMNode {{job_id: $job_id}})
+                WHERE n.id IN $related_ids
+                  AND {_NODE_FILTER_PREDICATES}
+                {_NODE_PAGE_RETURN}
+                """,
+                job_id=job_id,
+                related_ids=list(related_node_ids),
+                offset=offset,
+                limit=limit,
+                **filter_params,
+            )
 
-        offset = max(0, int(query.offset))
-        limit = max(1, int(query.limit))
-        paged_nodes = filtered_nodes[offset : offset + limit]
+        total, node_values = page_rows[0] if page_rows else (0, [])
+        paged_nodes = [_node_payload_from_values(values) for values in node_values or []]
         paged_ids = [str(node.get("id")) for node in paged_nodes if _clean_text(node.get("id"))]
 
         edges_payload: list[dict[str, Any]] = []
         if paged_ids:
+            # Directed match: each r is seen once, and (job_id, edge_key) is unique,
+            # so rows are already distinct without a server-side DISTINCT.
             edge_rows = self._execute_read(
+                session,
                 """
                 MATCH (a:BIMNode {job_id: $job_id})-[r:BIM_REL {job_id: $job_id}]->(b:BIMNode {job_id: $job_id})
                 WHERE a.id IN $node_ids
                   AND b.id IN $node_ids
                   AND ($relationship IS NULL OR toLower(coalesce(r.type, '')) = toLower($relationship))
-                RETURN DISTINCT startNode(r).id AS source,
-                                endNode(r).id AS target,
-                                coalesce(r.type, 'RELATED_TO') AS type
+                RETURN a.id AS source,
+                       b.id AS target,
+                       coalesce(r.type, 'RELATED_TO') AS type
                 """,
                 job_id=job_id,
                 node_ids=paged_ids,
                 relationship=relationship,
             )
-            edges_payload = _dedupe_edges(edge_rows)
+            edges_payload = edge_rows
 
         return {
             "nodes": paged_nodes,
             "edges": edges_payload,
-            "total": total,
+            "total": int(total or 0),
         }
 
     def query(self, job_id: str, query: Any) -> dict[str, Any]:
-        self._ensure_job_graph_exists(job_id)
-        return self._query_impl(job_id, query)
+        with self._read_session() as session:
+            self._ensure_job_graph_exists(session, job_id)
+            return self._query_impl(session, job_id, query)
 
     def subgraph(self, job_id: str, query: Any) -> dict[str, Any]:
-        self._ensure_job_graph_exists(job_id)
-        return self._query_impl(job_id, query)
+        with self._read_session() as session:
+            self._ensure_job_graph_exists(session, job_id)
+            return self._query_impl(session, job_id, query)
 
     def get_existing_node_ids(self, job_id: str, node_ids: list[str]) -> list[str]:
         if not node_ids:
             return []
-        cleaned_ids = [text for raw in node_ids if (text := _clean_text(raw))]
+        cleaned_ids = list(dict.fromkeys(text for raw in node_ids if (text := _clean_text(raw))))
         if not cleaned_ids:
             return []
 
-        self._ensure_job_graph_exists(job_id)
-        rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id})
-            WHERE n.id IN $node_ids
-            RETURN n.id AS id
-            """,
-            job_id=job_id,
-            node_ids=cleaned_ids,
-        )
-        existing = [str(row.get("id")) for row in rows if _clean_text(row.get("id"))]
-        return list(dict.fromkeys(existing))
+        existing: list[str] = []
+        with self._read_session() as session:
+            self._ensure_job_graph_exists(session, job_id)
+            for chunk in _iter_batches(cleaned_ids, _EXISTING_IDS_CHUNK_SIZE):
+                # Ids are unique per job (bim_node_job_id_unique), so no re-dedupe is needed.
+                existing.extend(
+                    self._execute_column(
+                        session,
+                        """
+                        MATCH (n:BIMNode {job_id: $job_id})
+                        USING INDEX n:BIMNode(job_id, id)
+                        WHERE n.id IN $node_ids
+                        RETURN n.id AS id
+                        """,
+                        job_id=job_id,
+                        node_ids=chunk,
+                    )
+                )
+        return existing
 
     # ---- Property query helpers (Phase 6) ----
 
@@ -783,75 +977,110 @@ class Neo4jGraphStore:
         Return all properties attached to a single element node.
         Optionally filter by pset name.
         """
-        self._ensure_job_graph_exists(job_id)
-        node_id = _clean_text(global_id)
-        if not self._get_node_by_id(job_id, node_id):
-            raise HTTPException(status_code=404, detail=f"Node not found: {node_id}")
+        with self._read_session() as session:
+            self._ensure_job_graph_exists(session, job_id)
+            node_id = _clean_text(global_id)
+            if not self._get_node_by_id(session, job_id, node_id):
+                raise HTTPException(status_code=404, detail=f"Node not found: {node_id}")
 
-        rows = self._execute_read(
-            """
-            MATCH (n:BIMNode {job_id: $job_id, id: $node_id})
-                  -[:HAS_PROP]->
-                  (p:BIMProp {job_id: $job_id})
-            WHERE $pset_name IS NULL
-               OR toLower(p.psetName) = toLower($pset_name)
-            RETURN p.psetName  AS psetName,
-                   p.propName  AS propName,
-                   p.value     AS value,
-                   p.valueType AS valueType
-            ORDER BY toLower(p.psetName), toLower(p.propName)
-            """,
-            job_id=job_id,
-            node_id=node_id,
-            pset_name=_clean_text(pset_name) or None,
-        )
-        return [
-            {
-                "psetName": row.get("psetName") or "",
-                "propName": row.get("propName") or "",
-                "value": row.get("value") or "",
-                "valueType": row.get("valueType") or "string",
-            }
-            for row in rows
-        ]
+            rows = self._execute_read(
+                session,
+                """
+                MATCH (n:BIMNode {job_id: $job_id, id: $node_id})
+                      -[:HAS_PROP]->
+                      (p:BIMProp {job_id: $job_id})
+                WHERE $pset_name IS NULL
+                   OR toLower(p.psetName) = toLower($pset_name)
+                RETURN p.psetName  AS psetName,
+                       p.propName  AS propName,
+                       p.value     AS value,
+                       p.valueType AS valueType
+                ORDER BY toLower(p.psetName), toLower(p.propName)
+                """,
+                job_id=job_id,
+                node_id=node_id,
+                pset_name=_clean_text(pset_name) or None,
+            )
+            return [
+                {
+                    "psetName": row.get("psetName") or "",
+                    "propName": row.get("propName") or "",
+                    "value": row.get("value") or "",
+                    "valueType": row.get("valueType") or "string",
+                }
+                for row in rows
+            ]
 
     def get_property_stats(self, job_id: str) -> dict[str, Any]:
         """Return aggregate counts of property sets and property names."""
-        self._ensure_job_graph_exists(job_id)
+        with self._read_session() as session:
+            self._ensure_job_graph_exists(session, job_id)
 
-        total_rows = self._execute_read(
-            "MATCH (p:BIMProp {job_id: $job_id}) RETURN count(p) AS count",
-            job_id=job_id,
-        )
-        pset_rows = self._execute_read(
-            """
-            MATCH (p:BIMProp {job_id: $job_id})
-            RETURN p.psetName AS psetName, count(*) AS count
-            ORDER BY count DESC
-            LIMIT 50
-            """,
-            job_id=job_id,
-        )
-        prop_rows = self._execute_read(
-            """
-            MATCH (p:BIMProp {job_id: $job_id})
-            RETURN p.propName AS propName, count(*) AS count
-            ORDER BY count DESC
-            LIMIT 50
-            """,
-            job_id=job_id,
-        )
+            total_rows = self._execute_read(
+                session,
+                "MATCH (p:BIMProp {job_id: $job_id}) RETURN count(p) AS count",
+                job_id=job_id,
+            )
+            pset_rows = self._execute_read(
+                session,
+                """
+                MATCH (p:BIMProp {job_id: $job_id})
+                RETURN p.psetName AS psetName, count(*) AS count
+                ORDER BY count DESC
+                LIMIT 50
+                """,
+                job_id=job_id,
+            )
+            prop_rows = self._execute_read(
+                session,
+                """
+                MATCH (p:BIMProp {job_id: $job_id})
+                RETURN p.propName AS propName, count(*) AS count
+                ORDER BY count DESC
+                LIMIT 50
+                """,
+                job_id=job_id,
+            )
 
-        return {
-            "total_properties": int((total_rows[0] if total_rows else {}).get("count") or 0),
-            "pset_counts": {
-                row["psetName"]: int(row["count"])
-                for row in pset_rows
-                if row.get("psetName")
-            },
-            "property_name_counts": {
-                row["propName"]: int(row["count"])
-                for row in prop_rows
-                if row.get("propName")
-            },
-        }
+            return {
+                "total_properties": int((total_rows[0] if total_rows else {}).get("count") or 0),
+                "pset_counts": {
+                    row["psetName"]: int(row["count"])
+                    for row in pset_rows
+                    if row.get("psetName")
+                },
+                "property_name_counts": {
+                    row["propName"]: int(row["count"])
+                    for row in prop_rows
+                    if row.get("propName")
+                },
+            }
+
+    # Async variants for the FastAPI graph endpoints. The sync methods above stay
+    # the primary API (LLM chat and the Cypher agent call them directly); these
+    # run them on a worker thread so Bolt round trips never block the event loop.
+    async def get_stats_async(self, job_id: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_stats, job_id)
+
+    async def get_neighbors_async(self, job_id: str, global_id: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_neighbors, job_id, global_id)
+
+    async def get_path_async(self, job_id: str, source_id: str, target_id: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_path, job_id, source_id, target_id)
+
+    async def query_async(self, job_id: str, query: Any) -> dict[str, Any]:
+        return await asyncio.to_thread(self.query, job_id, query)
+
+    async def subgraph_async(self, job_id: str, query: Any) -> dict[str, Any]:
+        return await asyncio.to_thread(self.subgraph, job_id, query)
+
+    async def get_element_properties_async(
+        self,
+        job_id: str,
+        global_id: str,
+        pset_name: str | None = None,
+    ) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self.get_element_properties, job_id, global_id, pset_name=pset_name)
+
+    async def get_property_stats_async(self, job_id: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_property_stats, job_id)
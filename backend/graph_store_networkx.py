@@ -4,24 +4,47 @@ NetworkX-backed graph store implementation.
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import heapq
 import json
-from collections import Counter, deque
+import logging
+import os
+import pickle
+from collections import Counter, OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import Any
+from threading import Lock
+from typing import Any, Iterable
 
 import networkx as nx
+import numpy as np
 from fastapi import HTTPException
 
-from config import OUTPUT_DIR
+from config import GRAPH_CACHE_MAX_JOBS, OUTPUT_DIR
 from graph_models import GraphQuery
 from utils import clean_text as _clean_text
 
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 _GRAPH_NOT_BUILT_MESSAGE = "Graph not built for this job. Re-process to enable."
+# Pickled (format, version, graph, indexes) written next to graph.json after a JSON load.
+# Bump the format whenever _prepare_graph changes what it stores.
+_GRAPH_PICKLE_NAME = "graph.cache.pkl"
+_GRAPH_PICKLE_FORMAT = 6
+# related_to traversals remembered per loaded graph version.
+_RELATED_CACHE_SIZE = 256
 
 
 def _node_payload(node_id: str, attrs: dict[str, Any]) -> dict[str, Any]:
     return {
-        "id": str(node_id),
+        "id": node_id,
         "globalId": str(attrs.get("globalId") or node_id),
         "label": attrs.get("label"),
         "ifcType": attrs.get("ifcType"),
@@ -31,143 +54,432 @@ def _node_payload(node_id: str, attrs: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def _node_sort_key(graph: nx.MultiDiGraph, node_id: str) -> tuple[str, str, str]:
-    attrs = graph.nodes[node_id]
-    return (
-        _clean_text(attrs.get("name")).lower(),
-        _clean_text(attrs.get("ifcType")).lower(),
-        str(node_id),
+@dataclass(frozen=True)
+class _AdjacencyCSR:
+    """
+    Undirected adjacency in CSR form over dense node positions.
+
+    Neighbors of position ``i`` are ``indices[indptr[i]:indptr[i + 1]]``, with the
+    lowercased edge type id of each entry in ``edge_type``. Every directed edge
+    appears once from each endpoint, matching the direction-agnostic BFS.
+    """
+
+    node_ids: list[str]
+    node_pos: dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    edge_type: np.ndarray
+    type_ids: dict[str, int]
+
+
+@dataclass(frozen=True)
+class _GraphIndexes:
+    """
+    Column-wise node attributes aligned with ``adjacency.node_ids`` for _run_query.
+
+    ifcType and storey are stored as int32 codes into their lowercased-value maps;
+    materials map each lowercased value to the positions of the nodes carrying it.
+    """
+
+    ifc_codes: np.ndarray
+    ifc_type_ids: dict[str, int]
+    storey_codes: np.ndarray
+    storey_ids: dict[str, int]
+    material_positions: dict[str, np.ndarray]
+    name_lc: list[str]
+    name_trigrams: dict[str, np.ndarray]
+    adjacency: _AdjacencyCSR
+    # get_stats payload (without job_id), summarized during the same load pass.
+    stats: dict[str, Any]
+
+    def equality_mask(
+        self,
+        node_type_lc: str | None,
+        storey_lc: str | None,
+        material_lc: str | None,
+    ) -> np.ndarray | None:
+        """AND of the requested equality filters as a boolean mask, or None when none apply."""
+        mask: np.ndarray | None = None
+        if node_type_lc:
+            mask = _code_mask(self.ifc_codes, self.ifc_type_ids.get(node_type_lc))
+        if storey_lc:
+            storey_mask = _code_mask(self.storey_codes, self.storey_ids.get(storey_lc))
+            mask = storey_mask if mask is None else mask & storey_mask
+        if material_lc:
+            material_mask = np.zeros(len(self.name_lc), dtype=bool)
+            positions = self.material_positions.get(material_lc)
+            if positions is not None:
+                material_mask[positions] = True
+            mask = material_mask if mask is None else mask & material_mask
+        return mask
+
+    def name_candidates(self, name_contains_lc: str) -> np.ndarray | None:
+        """
+        Sorted positions whose name holds every trigram of the search term.
+
+        Candidates still need a real substring check. Returns None for terms shorter
+        than a trigram, which must fall back to scanning.
+        """
+        grams = {name_contains_lc[i : i + 3] for i in range(len(name_contains_lc) - 2)}
+        if not grams:
+            return None
+        postings = [self.name_trigrams.get(gram) for gram in grams]
+        if any(posting is None for posting in postings):
+            return np.empty(0, dtype=np.int64)
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if candidates.size == 0:
+                break
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        return candidates
+
+
+def _code_mask(codes: np.ndarray, code: int | None) -> np.ndarray:
+    if code is None:
+        return np.zeros(len(codes), dtype=bool)
+    return codes == code
+
+
+def _build_adjacency(
+    node_ids: list[str],
+    sources: list[int],
+    targets: list[int],
+    edge_types: list[int],
+    type_ids: dict[str, int],
+) -> _AdjacencyCSR:
+    src = np.asarray(sources, dtype=np.int32)
+    dst = np.asarray(targets, dtype=np.int32)
+    types = np.asarray(edge_types, dtype=np.int32)
+
+    rows = np.concatenate((src, dst))
+    cols = np.concatenate((dst, src))
+    both_types = np.concatenate((types, types))
+    order = np.argsort(rows, kind="stable")
+
+    indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(node_ids)), out=indptr[1:])
+    return _AdjacencyCSR(
+        node_ids=node_ids,
+        node_pos={node_id: pos for pos, node_id in enumerate(node_ids)},
+        indptr=indptr,
+        indices=cols[order],
+        edge_type=both_types[order],
+        type_ids=type_ids,
+    )
+
+
+def _prepare_graph(graph: nx.MultiDiGraph) -> _GraphIndexes:
+    """Store normalized match keys on node/edge attrs and build the column indexes in one pass."""
+    node_ids: list[str] = []
+    name_lc: list[str] = []
+    ifc_type_ids: dict[str, int] = {}
+    storey_ids: dict[str, int] = {}
+    ifc_codes: list[int] = []
+    storey_codes: list[int] = []
+    material_positions: defaultdict[str, list[int]] = defaultdict(list)
+    name_trigrams: defaultdict[str, list[int]] = defaultdict(list)
+    node_type_counts: Counter[str] = Counter()
+    edge_type_counts: Counter[str] = Counter()
+    storeys: set[str] = set()
+    materials: set[str] = set()
+
+    for pos, (node_id, attrs) in enumerate(graph.nodes(data=True)):
+        ifc_type = _clean_text(attrs.get("ifcType"))
+        storey = _clean_text(attrs.get("storey"))
+        node_materials = {text for value in attrs.get("materials") or [] if (text := _clean_text(value))}
+        ifc_lc = attrs["_ifc_lc"] = ifc_type.lower()
+        storey_lc = attrs["_storey_lc"] = storey.lower()
+        materials_lc = attrs["_materials_lc"] = frozenset(value.lower() for value in node_materials)
+        attrs["_name_lc"] = _clean_text(attrs.get("name")).lower()
+
+        node_type_counts[ifc_type or "Unknown"] += 1
+        if storey:
+            storeys.add(storey)
+        materials.update(node_materials)
+
+        node_ids.append(node_id)
+        name_lc.append(attrs["_name_lc"])
+        ifc_codes.append(ifc_type_ids.setdefault(ifc_lc, len(ifc_type_ids)))
+        storey_codes.append(storey_ids.setdefault(storey_lc, len(storey_ids)))
+        for material_lc in materials_lc:
+            material_positions[material_lc].append(pos)
+        node_name = attrs["_name_lc"]
+        for gram in {node_name[i : i + 3] for i in range(len(node_name) - 2)}:
+            name_trigrams[gram].append(pos)
+
+    node_pos = {node_key: pos for pos, node_key in enumerate(node_ids)}
+    type_ids: dict[str, int] = {}
+    sources: list[int] = []
+    targets: list[int] = []
+    edge_types: list[int] = []
+    for source, target, attrs in graph.edges(data=True):
+        edge_type = _clean_text(attrs.get("type"))
+        type_lc = edge_type.lower()
+        attrs["_type"] = edge_type or "RELATED_TO"
+        attrs["_type_lc"] = type_lc
+        edge_type_counts[attrs["_type"]] += 1
+        sources.append(node_pos[source])
+        targets.append(node_pos[target])
+        edge_types.append(type_ids.setdefault(type_lc, len(type_ids)))
+
+    return _GraphIndexes(
+        ifc_codes=np.asarray(ifc_codes, dtype=np.int32),
+        ifc_type_ids=ifc_type_ids,
+        storey_codes=np.asarray(storey_codes, dtype=np.int32),
+        storey_ids=storey_ids,
+        material_positions={
+            key: np.asarray(positions, dtype=np.int64) for key, positions in material_positions.items()
+        },
+        name_lc=name_lc,
+        name_trigrams={gram: np.asarray(positions, dtype=np.int64) for gram, positions in name_trigrams.items()},
+        adjacency=_build_adjacency(node_ids, sources, targets, edge_types, type_ids),
+        stats={
+            "node_count": int(graph.number_of_nodes()),
+            "edge_count": int(graph.number_of_edges()),
+            "node_types": dict(sorted(node_type_counts.items(), key=lambda item: item[0].lower())),
+            "edge_types": dict(sorted(edge_type_counts.items(), key=lambda item: item[0].lower())),
+            "storeys": sorted(storeys, key=lambda value: value.lower()),
+            "materials": sorted(materials, key=lambda value: value.lower()),
+        },
     )
 
 
-def _edge_matches_relationship(attrs: dict[str, Any], relationship: str | None) -> bool:
-    if not relationship:
-        return True
-    return _clean_text(attrs.get("type")).lower() == relationship.lower()
+def _node_sort_key(graph: nx.MultiDiGraph, node_id: str) -> tuple[str, str, str]:
+    attrs = graph.nodes[node_id]
+    return (attrs["_name_lc"], attrs["_ifc_lc"], node_id)
 
 
 def _iter_incident_edges(
     graph: nx.MultiDiGraph,
     node_id: str,
-    relationship: str | None = None,
+    relationship_lc: str | None = None,
 ) -> list[tuple[str, str, dict[str, Any]]]:
-    incident: list[tuple[str, str, dict[str, Any]]] = []
-    for source, target, _key, attrs in graph.out_edges(node_id, keys=True, data=True):
-        if _edge_matches_relationship(attrs, relationship):
-            incident.append((str(source), str(target), attrs))
-    for source, target, _key, attrs in graph.in_edges(node_id, keys=True, data=True):
-        if _edge_matches_relationship(attrs, relationship):
-            incident.append((str(source), str(target), attrs))
+    incident = [
+        (node_id, target, attrs)
+        for target, keyed_edges in graph._succ[node_id].items()
+        for attrs in keyed_edges.values()
+    ]
+    incident.extend(
+        (source, node_id, attrs)
+        for source, keyed_edges in graph._pred[node_id].items()
+        for attrs in keyed_edges.values()
+    )
+    if relationship_lc:
+        return [edge for edge in incident if edge[2]["_type_lc"] == relationship_lc]
     return incident
 
 
 def _dedupe_edges(edge_tuples: list[tuple[str, str, dict[str, Any]]]) -> list[dict[str, Any]]:
-    seen: set[tuple[str, str, str]] = set()
-    edges: list[dict[str, Any]] = []
+    edges: dict[tuple[str, str, str], dict[str, Any]] = {}
     for source, target, attrs in edge_tuples:
-        edge_type = _clean_text(attrs.get("type")) or "RELATED_TO"
+        edge_type = attrs["_type"]
         key = (source, target, edge_type)
-        if key in seen:
-            continue
-        seen.add(key)
-        edges.append({"source": source, "target": target, "type": edge_type})
-    return edges
+        if key not in edges:
+            edges[key] = {"source": source, "target": target, "type": edge_type}
+    return list(edges.values())
 
 
 def _collect_related_nodes(
-    graph: nx.MultiDiGraph,
+    adjacency: _AdjacencyCSR,
     start_id: str,
     max_depth: int,
-    relationship: str | None = None,
-) -> set[str]:
-    visited: set[str] = {start_id}
-    queue = deque([(start_id, 0)])
-
-    while queue:
-        node_id, depth = queue.popleft()
-        if depth >= max_depth:
-            continue
-
-        for source, target, attrs in _iter_incident_edges(graph, node_id, relationship):
-            if not _edge_matches_relationship(attrs, relationship):
-                continue
-            neighbor = target if source == node_id else source
-            if neighbor in visited:
-                continue
-            visited.add(neighbor)
-            queue.append((neighbor, depth + 1))
+    relationship_lc: str | None = None,
+) -> np.ndarray:
+    """
+    Boolean mask over node positions of everything within max_depth hops of start_id
+    (either direction), optionally only following one edge type.
+    """
+    indptr = adjacency.indptr
+    visited = np.zeros(len(adjacency.node_ids), dtype=bool)
+    start = adjacency.node_pos[start_id]
+    visited[start] = True
+
+    type_id: int | None = None
+    if relationship_lc:
+        type_id = adjacency.type_ids.get(relationship_lc)
+        if type_id is None:
+            return visited
+    frontier = np.array([start], dtype=np.int64)
+
+    # Level-synchronous BFS: each round gathers every frontier row's CSR slice at once.
+    for _depth in range(max_depth):
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            break
+        slots = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+        if type_id is not None:
+            slots = slots[adjacency.edge_type[slots] == type_id]
+        neighbors = adjacency.indices[slots]
+        neighbors = np.unique(neighbors[~visited[neighbors]])
+        if neighbors.size == 0:
+            break
+        visited[neighbors] = True
+        frontier = neighbors.astype(np.int64)
 
     return visited
 
 
-def _node_matches_query(attrs: dict[str, Any], query: GraphQuery) -> bool:
-    if query.node_type:
-        if _clean_text(attrs.get("ifcType")).lower() != query.node_type.lower():
-            return False
-
-    if query.storey:
-        if _clean_text(attrs.get("storey")).lower() != query.storey.lower():
-            return False
-
-    if query.material:
-        mats = attrs.get("materials") or []
-        mat_values = {_clean_text(value).lower() for value in mats}
-        if query.material.lower() not in mat_values:
-            return False
-
-    if query.name_contains:
-        name = _clean_text(attrs.get("name")).lower()
-        if query.name_contains.lower() not in name:
-            return False
-
-    return True
+def _bidirectional_path(graph: nx.MultiDiGraph, source: str, target: str) -> list[str] | None:
+    """Shortest path ignoring edge direction, growing the smaller BFS frontier each round.
+
+    Reads the raw ``_succ``/``_pred`` adjacency dicts to skip the view wrappers;
+    parallel edges collapse because only neighbor keys are visited.
+    """
+    if source == target:
+        return [source]
+
+    succ = graph._succ
+    pred = graph._pred
+    forward_parents: dict[str, str | None] = {source: None}
+    backward_parents: dict[str, str | None] = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parents, other_parents = forward_frontier, forward_parents, backward_parents
+        else:
+            frontier, parents, other_parents = backward_frontier, backward_parents, forward_parents
+
+        next_frontier: list[str] = []
+        for node in frontier:
+            for neighbor in chain(succ[node], pred[node]):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = node
+                if neighbor in other_parents:
+                    return _join_bfs_parents(forward_parents, backward_parents, neighbor)
+                next_frontier.append(neighbor)
+
+        if frontier is forward_frontier:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    return None
+
+
+def _join_bfs_parents(
+    forward_parents: dict[str, str | None],
+    backward_parents: dict[str, str | None],
+    meeting: str,
+) -> list[str]:
+    path: list[str] = []
+    node: str | None = meeting
+    while node is not None:
+        path.append(node)
+        node = forward_parents[node]
+    path.reverse()
+    node = backward_parents[meeting]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+    return path
 
 
 def _collect_edges_for_nodes(
     graph: nx.MultiDiGraph,
-    node_ids: set[str],
-    relationship: str | None = None,
+    node_ids: list[str],
+    relationship_lc: str | None = None,
 ) -> list[dict[str, Any]]:
+    # Walk only the out-edges of the selected nodes; every edge internal to the
+    # selection is seen exactly once from its source.
+    node_set = set(node_ids)
     edge_tuples: list[tuple[str, str, dict[str, Any]]] = []
-    for source, target, _key, attrs in graph.edges(keys=True, data=True):
-        src = str(source)
-        tgt = str(target)
-        if src not in node_ids or tgt not in node_ids:
-            continue
-        if not _edge_matches_relationship(attrs, relationship):
-            continue
-        edge_tuples.append((src, tgt, attrs))
+    succ = graph._succ
+    if relationship_lc is None:
+        for node_id in node_ids:
+            for target, keyed_edges in succ[node_id].items():
+                if target in node_set:
+                    edge_tuples.extend((node_id, target, attrs) for attrs in keyed_edges.values())
+    else:
+        for node_id in node_ids:
+            for target, keyed_edges in succ[node_id].items():
+                if target not in node_set:
+                    continue
+                edge_tuples.extend(
+                    (node_id, target, attrs) for attrs in keyed_edges.values() if attrs["_type_lc"] == relationship_lc
+                )
     return _dedupe_edges(edge_tuples)
 
 
-def _run_query(graph: nx.MultiDiGraph, query: GraphQuery) -> dict[str, Any]:
+@dataclass
+class _CachedGraph:
+    """One loaded graph.json plus everything derived from it; replaced when the file changes."""
+
+    version: tuple[int, int]
+    graph: nx.MultiDiGraph
+    indexes: _GraphIndexes
+    related_cache: OrderedDict[tuple[str, int, str | None], np.ndarray] = field(default_factory=OrderedDict)
+    # Guards related_cache; queries on one graph may run on several worker threads.
+    lock: Lock = field(default_factory=Lock)
+
+    def related_mask(self, start_id: str, max_depth: int, relationship_lc: str | None) -> np.ndarray:
+        key = (start_id, max_depth, relationship_lc)
+        with self.lock:
+            cached = self.related_cache.get(key)
+            if cached is not None:
+                self.related_cache.move_to_end(key)
+                return cached
+        related = _collect_related_nodes(self.indexes.adjacency, start_id, max_depth, relationship_lc)
+        # Shared between callers; freeze it so nobody can modify the memoized mask in place.
+        related.flags.writeable = False
+        with self.lock:
+            self.related_cache[key] = related
+            if len(self.related_cache) > _RELATED_CACHE_SIZE:
+                self.related_cache.popitem(last=False)
+        return related
+
+
+def _run_query(entry: _CachedGraph, query: GraphQuery) -> dict[str, Any]:
+    graph = entry.graph
+    indexes = entry.indexes
+    relationship_lc = query.relationship.lower() if query.relationship else None
+    name_contains_lc = query.name_contains.lower() if query.name_contains else None
+
+    mask = indexes.equality_mask(
+        query.node_type.lower() if query.node_type else None,
+        query.storey.lower() if query.storey else None,
+        query.material.lower() if query.material else None,
+    )
+
     if query.related_to:
         related_id = _clean_text(query.related_to)
         if related_id not in graph:
             raise HTTPException(status_code=404, detail=f"Node not found in graph: {related_id}")
-        related_nodes = _collect_related_nodes(
-            graph,
-            related_id,
-            max_depth=query.max_depth,
-            relationship=query.relationship,
-        )
+        related = entry.related_mask(related_id, query.max_depth, relationship_lc)
+        mask = related if mask is None else mask & related
+
+    node_ids = indexes.adjacency.node_ids
+    name_candidates = indexes.name_candidates(name_contains_lc) if name_contains_lc else None
+    if name_candidates is not None:
+        if mask is not None:
+            name_candidates = name_candidates[mask[name_candidates]]
+        positions: Iterable[int] = name_candidates.tolist()
+    elif mask is None:
+        positions = range(len(node_ids))
     else:
-        related_nodes = {str(node_id) for node_id in graph.nodes}
-
-    filtered_nodes = [
-        str(node_id)
-        for node_id, attrs in graph.nodes(data=True)
-        if str(node_id) in related_nodes and _node_matches_query(attrs, query)
-    ]
+        positions = np.flatnonzero(mask).tolist()
+    if name_contains_lc:
+        name_lc = indexes.name_lc
+        filtered_nodes = [node_ids[pos] for pos in positions if name_contains_lc in name_lc[pos]]
+    else:
+        filtered_nodes = [node_ids[pos] for pos in positions]
 
-    filtered_nodes.sort(key=lambda node_id: _node_sort_key(graph, node_id))
     total = len(filtered_nodes)
-
-    paged_nodes = filtered_nodes[query.offset : query.offset + query.limit]
-    paged_node_set = set(paged_nodes)
+    # Only the first offset+limit nodes in sort order are needed for the page.
+    window = heapq.nsmallest(
+        query.offset + query.limit,
+        filtered_nodes,
+        key=lambda node_id: _node_sort_key(graph, node_id),
+    )
+    paged_nodes = window[query.offset :]
 
     nodes_payload = [_node_payload(node_id, graph.nodes[node_id]) for node_id in paged_nodes]
-    edges_payload = _collect_edges_for_nodes(graph, paged_node_set, relationship=query.relationship)
+    edges_payload = _collect_edges_for_nodes(graph, paged_nodes, relationship_lc=relationship_lc)
 
     return {
         "nodes": nodes_payload,
@@ -178,28 +490,93 @@ def _run_query(graph: nx.MultiDiGraph, query: GraphQuery) -> dict[str, Any]:
 
 class NetworkXGraphStore:
     def __init__(self) -> None:
-        self._graph_cache: dict[str, tuple[tuple[int, int], nx.MultiDiGraph]] = {}
+        # job_id -> loaded graph, least recently used first (bounded by GRAPH_CACHE_MAX_JOBS).
+        self._graph_cache: OrderedDict[str, _CachedGraph] = OrderedDict()
+        # _cache_lock guards _graph_cache itself; the per-job locks make concurrent
+        # misses for one job wait for a single load instead of parsing it twice.
+        self._cache_lock = Lock()
+        self._load_locks: dict[str, Lock] = {}
 
     def invalidate_cache(self, job_id: str) -> None:
-        self._graph_cache.pop(job_id, None)
+        with self._cache_lock:
+            self._graph_cache.pop(job_id, None)
+        self._pickle_path(job_id).unlink(missing_ok=True)
+
+    def _job_lock(self, job_id: str) -> Lock:
+        with self._cache_lock:
+            return self._load_locks.setdefault(job_id, Lock())
+
+    def _cached_entry(self, job_id: str, version: tuple[int, int]) -> _CachedGraph | None:
+        with self._cache_lock:
+            cached = self._graph_cache.get(job_id)
+            if cached is None or cached.version != version:
+                return None
+            self._graph_cache.move_to_end(job_id)
+            return cached
 
     def _graph_path(self, job_id: str) -> Path:
         return OUTPUT_DIR / job_id / "graph.json"
 
+    def _pickle_path(self, job_id: str) -> Path:
+        return OUTPUT_DIR / job_id / _GRAPH_PICKLE_NAME
+
+    def _read_pickle(self, job_id: str, version: tuple[int, int]) -> _CachedGraph | None:
+        pickle_path = self._pickle_path(job_id)
+        if not pickle_path.is_file():
+            return None
+        try:
+            with open(pickle_path, "rb") as handle:
+                cached_format, cached_version, graph, indexes = pickle.load(handle)
+        except Exception as exc:
+            logger.warning("Ignoring unreadable graph cache %s: %s", pickle_path, exc)
+            return None
+        if cached_format != _GRAPH_PICKLE_FORMAT or tuple(cached_version) != version:
+            return None
+        return _CachedGraph(version=version, graph=graph, indexes=indexes)
+
+    def _write_pickle(self, job_id: str, entry: _CachedGraph) -> None:
+        pickle_path = self._pickle_path(job_id)
+        tmp_path = pickle_path.with_suffix(".pkl.tmp")
+        try:
+            with open(tmp_path, "wb") as handle:
+                pickle.dump((_GRAPH_PICKLE_FORMAT, entry.version, entry.graph, entry.indexes), handle, protocol=5)
+            os.replace(tmp_path, pickle_path)
+        except Exception as exc:
+            logger.warning("Failed to write graph cache %s: %s", pickle_path, exc)
+            tmp_path.unlink(missing_ok=True)
+
     def load_graph(self, job_id: str) -> nx.MultiDiGraph:
+        return self._load_entry(job_id).graph
+
+    def _load_entry(self, job_id: str) -> _CachedGraph:
         graph_path = self._graph_path(job_id)
         if not graph_path.exists() or not graph_path.is_file():
             raise HTTPException(status_code=404, detail=_GRAPH_NOT_BUILT_MESSAGE)
 
         stat = graph_path.stat()
         version = (int(stat.st_mtime_ns), int(stat.st_size))
-        cached = self._graph_cache.get(job_id)
-        if cached and cached[0] == version:
-            return cached[1]
+        cached = self._cached_entry(job_id, version)
+        if cached is not None:
+            return cached
+
+        with self._job_lock(job_id):
+            cached = self._cached_entry(job_id, version)
+            if cached is not None:
+                return cached
+            return self._build_entry(job_id, graph_path, version)
+
+    def _build_entry(self, job_id: str, graph_path: Path, version: tuple[int, int]) -> _CachedGraph:
+        entry = self._read_pickle(job_id, version)
+        if entry is not None:
+            self._remember(job_id, entry)
+            return entry
 
         try:
-            with open(graph_path, "r", encoding="utf-8") as handle:
-                raw = json.load(handle)
+            if orjson is not None:
+                raw = orjson.loads(graph_path.read_bytes())
+            else:
+                with open(graph_path, "r", encoding="utf-8") as handle:
+                    raw = json.load(handle)
         except Exception as exc:
             raise HTTPException(status_code=500, detail=f"Failed to read graph.json: {exc}")
 
@@ -218,44 +595,25 @@ class NetworkXGraphStore:
             raise HTTPException(status_code=500, detail=f"Failed to parse graph.json: {exc}")
 
         graph = graph_obj if isinstance(graph_obj, nx.MultiDiGraph) else nx.MultiDiGraph(graph_obj)
-        self._graph_cache[job_id] = (version, graph)
-        return graph
+        if not all(isinstance(node_id, str) for node_id in graph):
+            # Normalize ids once here so the query helpers never need str() casts.
+            graph = nx.relabel_nodes(graph, str)
+        entry = _CachedGraph(version=version, graph=graph, indexes=_prepare_graph(graph))
+        self._remember(job_id, entry)
+        self._write_pickle(job_id, entry)
+        return entry
+
+    def _remember(self, job_id: str, entry: _CachedGraph) -> None:
+        with self._cache_lock:
+            self._graph_cache[job_id] = entry
+            self._graph_cache.move_to_end(job_id)
+            while len(self._graph_cache) > GRAPH_CACHE_MAX_JOBS:
+                self._graph_cache.popitem(last=False)
 
     def get_stats(self, job_id: str) -> dict[str, Any]:
-        graph = self.load_graph(job_id)
-
-        node_types: Counter[str] = Counter()
-        edge_types: Counter[str] = Counter()
-        storeys: set[str] = set()
-        materials: set[str] = set()
-
-        for _node_id, attrs in graph.nodes(data=True):
-            ifc_type = _clean_text(attrs.get("ifcType")) or "Unknown"
-            node_types[ifc_type] += 1
-
-            storey = _clean_text(attrs.get("storey"))
-            if storey:
-                storeys.add(storey)
-
-            node_materials = attrs.get("materials") or []
-            for material in node_materials:
-                text = _clean_text(material)
-                if text:
-                    materials.add(text)
-
-        for _source, _target, attrs in graph.edges(data=True):
-            edge_type = _clean_text(attrs.get("type")) or "RELATED_TO"
-            edge_types[edge_type] += 1
-
-        return {
-            "job_id": job_id,
-            "node_count": int(graph.number_of_nodes()),
-            "edge_count": int(graph.number_of_edges()),
-            "node_types": dict(sorted(node_types.items(), key=lambda item: item[0].lower())),
-            "edge_types": dict(sorted(edge_types.items(), key=lambda item: item[0].lower())),
-            "storeys": sorted(storeys, key=lambda value: value.lower()),
-            "materials": sorted(materials, key=lambda value: value.lower()),
-        }
+        stats = self._load_entry(job_id).indexes.stats
+        # Callers get their own copy; the cached stats are shared across requests.
+        return {"job_id": job_id, **copy.deepcopy(stats)}
 
     def get_neighbors(self, job_id: str, global_id: str) -> dict[str, Any]:
         graph = self.load_graph(job_id)
@@ -293,12 +651,9 @@ class NetworkXGraphStore:
         if target not in graph:
             raise HTTPException(status_code=404, detail=f"Node not found in graph: {target}")
 
-        try:
-            path_ids = [str(node_id) for node_id in nx.shortest_path(graph.to_undirected(as_view=True), source, target)]
-        except nx.NetworkXNoPath:
+        path_ids = _bidirectional_path(graph, source, target)
+        if path_ids is None:
             raise HTTPException(status_code=404, detail=f"No path found between {source} and {target}")
-        except Exception as exc:
-            raise HTTPException(status_code=500, detail=f"Failed to compute path: {exc}")
 
         edge_tuples: list[tuple[str, str, dict[str, Any]]] = []
         for idx in range(len(path_ids) - 1):
@@ -316,8 +671,7 @@ class NetworkXGraphStore:
                     candidates.append((right, left, data))
 
             if candidates:
-                candidates.sort(key=lambda item: _clean_text(item[2].get("type")).lower())
-                edge_tuples.append(candidates[0])
+                edge_tuples.append(min(candidates, key=lambda item: item[2]["_type_lc"]))
 
         nodes_payload = [_node_payload(node_id, graph.nodes[node_id]) for node_id in path_ids]
         edges_payload = _dedupe_edges(edge_tuples)
@@ -330,16 +684,36 @@ class NetworkXGraphStore:
         }
 
     def query(self, job_id: str, query: GraphQuery) -> dict[str, Any]:
-        graph = self.load_graph(job_id)
-        return _run_query(graph, query)
+        return _run_query(self._load_entry(job_id), query)
 
     def subgraph(self, job_id: str, query: GraphQuery) -> dict[str, Any]:
-        graph = self.load_graph(job_id)
-        return _run_query(graph, query)
+        return _run_query(self._load_entry(job_id), query)
 
     def get_existing_node_ids(self, job_id: str, node_ids: list[str]) -> list[str]:
         if not node_ids:
             return []
-        graph = self.load_graph(job_id)
-        existing = [node_id for node_id in node_ids if node_id in graph]
-        return list(dict.fromkeys(existing))
+        graph_nodes = self.load_graph(job_id)._node
+        seen: set[str] = set()
+        existing: list[str] = []
+        for node_id in node_ids:
+            if node_id in graph_nodes and node_id not in seen:
+                seen.add(node_id)
+                existing.append(node_id)
+        return existing
+
+    # Async variants for the FastAPI graph endpoints: BFS, filtering and graph
+    # loading are CPU-bound, so they run on a worker thread instead of the event loop.
+    async def get_stats_async(self, job_id: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_stats, job_id)
+
+    async def get_neighbors_async(self, job_id: str, global_id: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_neighbors, job_id, global_id)
+
+    async def get_path_async(self, job_id: str, source_id: str, target_id: str) -> dict[str, Any]:
+        return await asyncio.to_thread(self.get_path, job_id, source_id, target_id)
+
+    async def query_async(self, job_id: str, query: GraphQuery) -> dict[str, Any]:
+        return await asyncio.to_thread(self.query, job_id, query)
+
+    async def subgraph_async(self, job_id: str, query: GraphQuery) -> dict[str, Any]:
+        return await asyncio.to_thread(self.subgraph, job_id, query)
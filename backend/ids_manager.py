@@ -6,19 +6,36 @@ Uses the official buildingSMART IDS XSD schema for validation.
 """
 
 import json
+import os
 import re
-import xml.etree.ElementTree as ET
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from lxml import etree
 
 from config import OUTPUT_DIR
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Constants
 MAX_IDS_FILE_SIZE = 10 * 1024 * 1024  # 10 MB
+_AUDIT_WRITE_BUFFER = 1 << 20  # 1 MB
+_TEMPLATE_SCAN_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+# Job IDs whose ids/ directory is known to exist (job IDs are never reused after deletion)
+_JOB_IDS_DIRS_CREATED: set[str] = set()
+# Upload filenames keep ASCII letters, digits, "_", "-" and "."; everything else becomes "_"
+_SAFE_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + "_-.")
+_UNSAFE_FILENAME_CHARS = {i: "_" for i in range(128) if chr(i) not in _SAFE_FILENAME_CHARS}
 IDS_SCHEMA_DIR = Path(__file__).parent / "ids_schema"
 IDS_SCHEMA_PATH = IDS_SCHEMA_DIR / "ids.xsd"
 DEFAULT_IDS_DIR = Path(__file__).parent / "ids_templates"
@@ -27,6 +44,30 @@ IDS_NAMESPACES = {
     "ids": IDS_NAMESPACE,
     "xs": "http://www.w3.org/2001/XMLSchema",
 }
+_IDS_INFO_TAG = f"{{{IDS_NAMESPACE}}}info"
+_IDS_SPECIFICATION_TAG = f"{{{IDS_NAMESPACE}}}specification"
+
+# XXE markers rejected on upload, matched against lowercased bytes. Case-sensitive
+# patterns keep re's literal-prefix scan, which re.IGNORECASE disables.
+_DANGEROUS_PATTERNS = (
+    (re.compile(rb"<!entity"), "External entity declarations not allowed"),
+    (re.compile(rb"<!doctype.*\["), "Internal DTD subset not allowed"),
+    (re.compile(rb"system\s+[\"']"), "SYSTEM identifiers not allowed"),
+    (re.compile(rb"public\s+[\"']"), "PUBLIC identifiers not allowed"),
+)
+
+# Compiled XSD schemas keyed by (path, mtime_ns); compiling ids.xsd dominates Gate 1 cost.
+_SCHEMA_CACHE: dict[tuple[str, int], etree.XMLSchema] = {}
+_SCHEMA_CACHE_LOCK = threading.Lock()
+# A shared XMLSchema keeps its error_log on the instance, so validations must not overlap.
+_SCHEMA_VALIDATE_LOCK = threading.Lock()
+# Serializes validate_ifc_against_many_ids while ifctester's pset caches are swapped.
+_PSET_CACHE_LOCK = threading.Lock()
+# ifctester release line whose facet internals _model_scoped_pset_cache was written against.
+_PSET_CACHE_IFCTESTER_VERSION = "0.8."
+
+# lxml parsers are not thread-safe, so each worker thread keeps its own hardened parser.
+_PARSER_LOCAL = threading.local()
 
 # Valid IFC entity types for semantic validation
 # Support common IFC version patterns - be lenient with variations
@@ -40,20 +81,18 @@ VALID_IFC_VERSION_PATTERNS = [
     "IFC4X3_ADD2",
 ]
 
+_VALID_IFC_VERSIONS = frozenset(VALID_IFC_VERSION_PATTERNS)
+
+
+@lru_cache(maxsize=64)
 def is_valid_ifc_version(version: str) -> bool:
     """Check if an IFC version string is valid (case-insensitive)."""
     v_upper = version.upper().strip()
-    # Check exact matches
-    for pattern in VALID_IFC_VERSION_PATTERNS:
-        if v_upper == pattern:
-            return True
-    # Also allow versions that start with IFC (for future compatibility)
-    if v_upper.startswith("IFC"):
-        return True
-    return False
+    # Exact matches, or any version that starts with IFC (for future compatibility)
+    return v_upper in _VALID_IFC_VERSIONS or v_upper.startswith("IFC")
 
 
-@dataclass
+@dataclass(slots=True)
 class IdsValidationError:
     """Represents a single validation error."""
     message: str
@@ -61,6 +100,17 @@ class IdsValidationError:
     column: Optional[int] = None
     severity: str = "error"  # error, warning
     
+    @classmethod
+    def from_log_entry(cls, entry: Any) -> "IdsValidationError":
+        """Build an error from an lxml error-log entry, skipping the generated __init__."""
+        # Must assign every field declared above
+        error = object.__new__(cls)
+        error.message = entry.message
+        error.line = entry.line
+        error.column = entry.column
+        error.severity = "error"
+        return error
+    
     def to_dict(self) -> dict:
         return {
             "message": self.message,
@@ -70,7 +120,7 @@ class IdsValidationError:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class IdsAuditResult:
     """Result of the two-gate IDS validation."""
     filename: str = ""
@@ -104,7 +154,7 @@ class IdsAuditResult:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class IdsValidationResult:
     """Result of validating an IFC file against an IDS specification."""
     ids_filename: str
@@ -128,7 +178,10 @@ class IdsValidationResult:
 def get_job_ids_dir(job_id: str) -> Path:
     """Get the IDS directory for a specific job."""
     ids_dir = OUTPUT_DIR / job_id / "ids"
-    ids_dir.mkdir(parents=True, exist_ok=True)
+    if job_id not in _JOB_IDS_DIRS_CREATED:
+        # mkdir(exist_ok=True) is idempotent, so concurrent first calls need no lock
+        ids_dir.mkdir(parents=True, exist_ok=True)
+        _JOB_IDS_DIRS_CREATED.add(job_id)
     return ids_dir
 
 
@@ -137,7 +190,11 @@ def save_uploaded_ids(job_id: str, filename: str, content: bytes) -> Path:
     job_ids_dir = get_job_ids_dir(job_id)
     
     # Sanitize filename
-    safe_filename = re.sub(r'[^\w\-_\.]', '_', filename)
+    if filename.isascii():
+        safe_filename = filename.translate(_UNSAFE_FILENAME_CHARS)
+    else:
+        # Same rule as the ASCII table, with Unicode letters/digits kept like regex \w
+        safe_filename = "".join(c if c.isalnum() or c in "_-." else "_" for c in filename)
     if not safe_filename.lower().endswith('.ids'):
         safe_filename += '.ids'
     
@@ -161,16 +218,26 @@ def delete_uploaded_ids(job_id: str, filename: str) -> bool:
     return False
 
 
+def _scan_ids_files(directory: Path) -> list[Path]:
+    """List *.ids files in a directory using scandir's cached entry types."""
+    with os.scandir(directory) as entries:
+        return [
+            Path(entry.path)
+            for entry in entries
+            if os.path.normcase(entry.name).endswith(".ids") and entry.is_file()
+        ]
+
+
 def list_uploaded_ids_files(job_id: str) -> list[Path]:
     """List all IDS files uploaded for a job."""
     job_ids_dir = get_job_ids_dir(job_id)
-    return list(job_ids_dir.glob("*.ids"))
+    return _scan_ids_files(job_ids_dir)
 
 
 def list_default_ids_files() -> list[Path]:
     """List default IDS template files."""
     if DEFAULT_IDS_DIR.exists():
-        return list(DEFAULT_IDS_DIR.glob("*.ids"))
+        return _scan_ids_files(DEFAULT_IDS_DIR)
     return []
 
 
@@ -181,67 +248,129 @@ def list_all_ids_templates() -> dict:
         "byJob": {},
     }
     
-    # Default templates
-    for ids_file in list_default_ids_files():
-        info = get_ids_info(ids_file)
-        if info:
-            info["filename"] = ids_file.name
-            result["default"].append(info)
-    
-    # Job-specific templates
-    for job_dir in OUTPUT_DIR.iterdir():
-        if job_dir.is_dir():
-            job_id = job_dir.name
-            job_ids = list_uploaded_ids_files(job_id)
-            if job_ids:
-                result["byJob"][job_id] = []
-                for ids_file in job_ids:
-                    info = get_ids_info(ids_file)
-                    if info:
-                        info["filename"] = ids_file.name
-                        result["byJob"][job_id].append(info)
+    # Collect every (bucket, file) pair first; bucket is None for default templates
+    targets: list[tuple[Optional[str], Path]] = [(None, ids_file) for ids_file in list_default_ids_files()]
+    with os.scandir(OUTPUT_DIR) as job_dirs:
+        job_ids = [entry.name for entry in job_dirs if entry.is_dir()]
+    for job_id in job_ids:
+        job_ids_files = list_uploaded_ids_files(job_id)
+        if job_ids_files:
+            result["byJob"][job_id] = []
+            targets.extend((job_id, ids_file) for ids_file in job_ids_files)
+    
+    if not targets:
+        return result
+    
+    # libxml2 releases the GIL while parsing, so threads overlap the per-file work
+    with ThreadPoolExecutor(max_workers=min(_TEMPLATE_SCAN_WORKERS, len(targets))) as executor:
+        infos = executor.map(get_ids_info, [ids_file for _, ids_file in targets])
+        for (job_id, ids_file), info in zip(targets, infos):
+            if info:
+                info["filename"] = ids_file.name
+                bucket = result["default"] if job_id is None else result["byJob"][job_id]
+                bucket.append(info)
     
     return result
 
 
 def get_ids_info(ids_path: Path) -> Optional[dict]:
     """Extract metadata from an IDS file."""
-    if not ids_path.exists():
+    try:
+        stat = ids_path.stat()
+    except OSError:
         return None
     
+    # Unchanged files are served from the cache; callers get their own copy to annotate
+    return dict(_get_ids_info_cached(str(ids_path), stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=256)
+def _get_ids_info_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    """Read IDS metadata; mtime_ns and size only key the cache so edited files miss."""
+    info = {
+        "title": None,
+        "description": None,
+        "author": None,
+        "version": None,
+        "date": None,
+        "specificationCount": 0,
+    }
+
     try:
-        tree = ET.parse(ids_path)
-        root = tree.getroot()
-        
-        # Handle namespace
-        ns = {"ids": IDS_NAMESPACE}
-        
-        info = {
-            "title": None,
-            "description": None,
-            "author": None,
-            "version": None,
-            "date": None,
-            "specificationCount": 0,
-        }
-        
-        # Try to get info element
-        info_elem = root.find("ids:info", ns) or root.find("info")
-        if info_elem is not None:
-            for child in info_elem:
-                tag = child.tag.split("}")[-1] if "}" in child.tag else child.tag
-                if tag in info:
-                    info[tag] = child.text
-        
-        # Count specifications
-        specs = root.findall(".//ids:specification", ns) or root.findall(".//specification")
-        info["specificationCount"] = len(specs)
-        
+        # Stream the document: only the top-level info block is read, and
+        # specifications are counted and discarded as they close.
+        context = etree.iterparse(
+            path_str,
+            events=("end",),
+            tag=[_IDS_INFO_TAG, "info", _IDS_SPECIFICATION_TAG, "specification"],
+            resolve_entities=False,
+            no_network=True,
+            remove_comments=True,
+            remove_pis=True,
+        )
+        info_fields: dict[str, dict] = {}
+        spec_counts = {_IDS_SPECIFICATION_TAG: 0, "specification": 0}
+        for _, elem in context:
+            if elem.tag in spec_counts:
+                spec_counts[elem.tag] += 1
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+                continue
+
+            parent = elem.getparent()
+            if parent is not None and parent.getparent() is None and elem.tag not in info_fields:
+                fields = info_fields[elem.tag] = {}
+                for child in elem:
+                    # One .tag read per child; lxml builds a new string on every access
+                    tag = child.tag.rpartition("}")[2]
+                    if tag in info:
+                        fields[tag] = child.text
+            elem.clear()
+
+        # Prefer the namespaced info block, as the IDS schema requires
+        info.update(info_fields.get(_IDS_INFO_TAG, info_fields.get("info", {})))
+        info["specificationCount"] = spec_counts[_IDS_SPECIFICATION_TAG] or spec_counts["specification"]
+
         return info
     except Exception as e:
         return {"error": str(e)}
 
 
+def _get_doc_parser() -> etree.XMLParser:
+    """Return this thread's reusable parser for untrusted IDS documents."""
+    parser = getattr(_PARSER_LOCAL, "doc_parser", None)
+    if parser is None:
+        # IDS never uses xml:id lookups, comments or PIs, so skip building them
+        parser = _PARSER_LOCAL.doc_parser = etree.XMLParser(
+            resolve_entities=False,
+            no_network=True,
+            collect_ids=False,
+            remove_comments=True,
+            remove_pis=True,
+        )
+    return parser
+
+
+def _get_compiled_schema() -> etree.XMLSchema:
+    """Return the compiled IDS XSD schema, recompiling only when the file changes."""
+    schema_path = str(IDS_SCHEMA_PATH)
+    key = (schema_path, IDS_SCHEMA_PATH.stat().st_mtime_ns)
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is not None:
+        return schema
+
+    with _SCHEMA_CACHE_LOCK:
+        schema = _SCHEMA_CACHE.get(key)
+        if schema is None:
+            schema_parser = etree.XMLParser(resolve_entities=False)
+            schema = etree.XMLSchema(etree.parse(schema_path, schema_parser))
+            # Drop entries for older revisions of the schema file.
+            _SCHEMA_CACHE.clear()
+            _SCHEMA_CACHE[key] = schema
+    return schema
+
+
 def validate_ids_xsd_schema(ids_path: Path) -> tuple[bool, list[IdsValidationError]]:
     """
     Validate an IDS file against the official XSD schema.
@@ -254,33 +383,22 @@ def validate_ids_xsd_schema(ids_path: Path) -> tuple[bool, list[IdsValidationErr
         return False, [IdsValidationError(message=f"IDS schema not found: {IDS_SCHEMA_PATH}")]
 
     try:
-        schema_parser = etree.XMLParser(resolve_entities=False)
-        schema_doc = etree.parse(str(IDS_SCHEMA_PATH), schema_parser)
-        schema = etree.XMLSchema(schema_doc)
+        schema = _get_compiled_schema()
     except (etree.XMLSchemaParseError, etree.XMLSyntaxError, OSError) as e:
         return False, [IdsValidationError(message=f"Failed to load IDS XSD schema: {e}")]
 
     try:
-        doc_parser = etree.XMLParser(resolve_entities=False, no_network=True)
-        doc = etree.parse(str(ids_path), doc_parser)
+        doc = etree.parse(str(ids_path), _get_doc_parser())
     except etree.XMLSyntaxError as e:
-        line = None
-        column = None
-        if getattr(e, "position", None):
-            line, column = e.position
+        # lxml always sets position to a (line, column) tuple
+        line, column = e.position
         return False, [IdsValidationError(message=f"XML syntax error: {e}", line=line, column=column)]
 
-    if schema.validate(doc):
-        return True, []
+    with _SCHEMA_VALIDATE_LOCK:
+        if schema.validate(doc):
+            return True, []
 
-    errors = [
-        IdsValidationError(
-            message=err.message,
-            line=err.line,
-            column=err.column,
-        )
-        for err in schema.error_log
-    ]
+        errors = [IdsValidationError.from_log_entry(err) for err in schema.error_log]
     if not errors:
         errors.append(IdsValidationError(message="IDS file failed XSD schema validation."))
     return False, errors
@@ -291,114 +409,135 @@ def validate_ids_xml_structure(ids_path: Path) -> tuple[bool, list[str]]:
     Validate basic XML structure of an IDS file.
     Uses structural validation to ensure the IDS file has required elements.
     Returns (is_valid, list_of_errors).
+
+    Not part of validate_ids_file: Gate 1's XSD validation already enforces
+    these rules, so the upload path never parses the document a second time.
     """
-    errors = []
-    
     try:
-        # First check if XML is well-formed
+        stat = ids_path.stat()
+    except OSError:
+        # Let the parser report the missing/unreadable file as before
+        is_valid, errors = _validate_ids_xml_structure_cached.__wrapped__(str(ids_path), 0, 0)
+    else:
+        is_valid, errors = _validate_ids_xml_structure_cached(str(ids_path), stat.st_mtime_ns, stat.st_size)
+    return is_valid, list(errors)
+
+
+@lru_cache(maxsize=256)
+def _validate_ids_xml_structure_cached(path_str: str, mtime_ns: int, size: int) -> tuple[bool, tuple[str, ...]]:
+    """Run the structure checks; mtime_ns and size only key the cache so edited files miss."""
+    try:
+        # Stream the document once, surfacing only the section elements; each
+        # specification is checked as it closes and then freed, so memory stays
+        # flat for large IDS files. "{*}" matches any namespace or none.
+        context = etree.iterparse(
+            path_str,
+            events=("end",),
+            tag=("{*}info", "{*}specifications", "{*}specification"),
+            resolve_entities=False,
+            no_network=True,
+            collect_ids=False,
+            remove_comments=True,
+            remove_pis=True,
+        )
+        root = None
+        info_elem = specs_elem = None
+        info_tag = title_tag = specifications_tag = specification_tag = applicability_tag = ""
+        title_ok = False
+        spec_count = 0
+        spec_errors = []
         try:
-            doc = etree.parse(str(ids_path))
+            for _, elem in context:
+                if root is None:
+                    root = elem.getroottree().getroot()
+                    # Children share the root's namespace (or none), so tags are resolved once
+                    ns_prefix = f"{{{etree.QName(root).namespace}}}" if '}' in root.tag else ""
+                    info_tag = f"{ns_prefix}info"
+                    title_tag = f"{ns_prefix}title"
+                    specifications_tag = f"{ns_prefix}specifications"
+                    specification_tag = f"{ns_prefix}specification"
+                    applicability_tag = f"{ns_prefix}applicability"
+                
+                parent = elem.getparent()
+                if parent is None:
+                    continue
+                if elem.tag == specification_tag and parent.tag == specifications_tag and parent.getparent() is root:
+                    # Specifications inside a later <specifications> close after the first one did
+                    if specs_elem is None:
+                        specs_elem = parent
+                    if parent is specs_elem:
+                        spec_count += 1
+                        _check_ids_specification(elem, spec_count, applicability_tag, spec_errors)
+                        elem.clear()
+                        while elem.getprevious() is not None:
+                            del parent[0]
+                elif parent is root:
+                    if elem.tag == info_tag and info_elem is None:
+                        info_elem = elem
+                        title_elem = next((child for child in elem if child.tag == title_tag), None)
+                        title_ok = title_elem is not None and bool(title_elem.text and title_elem.text.strip())
+                    elif elem.tag == specifications_tag and specs_elem is None:
+                        specs_elem = elem
+                    elem.clear()
         except etree.XMLSyntaxError as e:
-            return False, [f"XML syntax error: {e}"]
-        
-        root = doc.getroot()
+            return False, (f"XML syntax error: {e}",)
+        if root is None:
+            root = context.root
+        root_ns = etree.QName(root).namespace if '}' in root.tag else None
         
         # Check root element - handle both namespaced and non-namespaced
         root_tag = etree.QName(root.tag).localname if '}' in root.tag else root.tag
         if root_tag != "ids":
-            errors.append(f"Root element must be 'ids', found '{root_tag}'")
-            return False, errors
+            return False, (f"Root element must be 'ids', found '{root_tag}'",)
+        
+        errors = []
         
         # Check namespace (if present, should be the IDS namespace)
-        root_ns = etree.QName(root.tag).namespace if '}' in root.tag else None
         if root_ns and root_ns != IDS_NAMESPACE:
             errors.append(f"Invalid namespace '{root_ns}'. Expected '{IDS_NAMESPACE}'")
         
-        # Build namespace map for queries
-        # Support both default namespace and prefixed namespace
-        ns = {}
-        if root_ns == IDS_NAMESPACE:
-            ns["ids"] = IDS_NAMESPACE
-        
-        def find_element(parent, local_name):
-            """Find element with or without namespace."""
-            if ns:
-                elem = parent.find(f"ids:{local_name}", ns)
-                if elem is not None:
-                    return elem
-            # Try without namespace (for elements in default namespace)
-            elem = parent.find(local_name)
-            if elem is not None:
-                return elem
-            # Try with explicit namespace in tag
-            for child in parent:
-                child_local = etree.QName(child.tag).localname if '}' in child.tag else child.tag
-                if child_local == local_name:
-                    return child
-            return None
-        
-        def find_elements(parent, local_name):
-            """Find all elements with or without namespace."""
-            results = []
-            if ns:
-                results.extend(parent.findall(f"ids:{local_name}", ns))
-            results.extend(parent.findall(local_name))
-            # Also check direct children
-            for child in parent:
-                child_local = etree.QName(child.tag).localname if '}' in child.tag else child.tag
-                if child_local == local_name and child not in results:
-                    results.append(child)
-            return results
-        
-        # Check for info element
-        info_elem = find_element(root, "info")
+        # Check for info element and its required title
         if info_elem is None:
             errors.append("Missing required 'info' element")
-        else:
-            # Check for required title in info
-            title_elem = find_element(info_elem, "title")
-            if title_elem is None or not (title_elem.text and title_elem.text.strip()):
-                errors.append("Missing required 'title' element in info")
+        elif not title_ok:
+            errors.append("Missing required 'title' element in info")
         
-        # Check for specifications element
-        specs_elem = find_element(root, "specifications")
+        # Check for specifications element with at least one specification
         if specs_elem is None:
             errors.append("Missing required 'specifications' element")
         else:
-            # Check for at least one specification
-            specs = find_elements(specs_elem, "specification")
-            if not specs:
+            if not spec_count:
                 errors.append("IDS file must contain at least one specification")
-            
-            # Validate each specification
-            for i, spec in enumerate(specs):
-                spec_name = spec.get("name", f"Specification {i+1}")
-                ifc_version = spec.get("ifcVersion")
-                
-                # Check required ifcVersion attribute
-                if not ifc_version:
-                    errors.append(f"{spec_name}: Missing required 'ifcVersion' attribute")
-                else:
-                    # Validate ifcVersion values (space-separated list)
-                    versions = ifc_version.split()
-                    for v in versions:
-                        if not is_valid_ifc_version(v):
-                            errors.append(f"{spec_name}: Invalid ifcVersion '{v}'. Expected IFC version format (e.g., IFC2X3, IFC4)")
-                
-                # Check for applicability
-                applicability = find_element(spec, "applicability")
-                if applicability is None:
-                    errors.append(f"{spec_name}: Missing required 'applicability' element")
-                else:
-                    # Check applicability has at least one facet
-                    facets = list(applicability)
-                    if not facets:
-                        errors.append(f"{spec_name}: Applicability must contain at least one facet (entity, classification, attribute, property, or material)")
+            errors.extend(spec_errors)
         
-        return len(errors) == 0, errors
+        return len(errors) == 0, tuple(errors)
     
     except Exception as e:
-        return False, [f"Validation error: {e}"]
+        return False, (f"Validation error: {e}",)
+
+
+def _check_ids_specification(spec: Any, index: int, applicability_tag: str, errors: list[str]) -> None:
+    """Append structural errors for one closed specification element."""
+    spec_name = spec.get("name", f"Specification {index}")
+    ifc_version = spec.get("ifcVersion")
+    
+    # Check required ifcVersion attribute
+    if not ifc_version:
+        errors.append(f"{spec_name}: Missing required 'ifcVersion' attribute")
+    else:
+        # Validate ifcVersion values (space-separated list)
+        versions = ifc_version.split()
+        for v in versions:
+            if not is_valid_ifc_version(v):
+                errors.append(f"{spec_name}: Invalid ifcVersion '{v}'. Expected IFC version format (e.g., IFC2X3, IFC4)")
+    
+    # Check for applicability
+    applicability = next((child for child in spec if child.tag == applicability_tag), None)
+    if applicability is None:
+        errors.append(f"{spec_name}: Missing required 'applicability' element")
+    elif len(applicability) == 0:
+        # Applicability must hold at least one facet
+        errors.append(f"{spec_name}: Applicability must contain at least one facet (entity, classification, attribute, property, or material)")
 
 
 def validate_file_security(content: bytes, filename: str) -> tuple[bool, list[str]]:
@@ -408,21 +547,15 @@ def validate_file_security(content: bytes, filename: str) -> tuple[bool, list[st
     """
     issues = []
     
-    # Check file size
+    # Check file size; oversized uploads are rejected without scanning the body
     if len(content) > MAX_IDS_FILE_SIZE:
         issues.append(f"File exceeds maximum size of {MAX_IDS_FILE_SIZE // (1024*1024)} MB")
+        return False, issues
     
-    # Check for potential XXE attacks
-    content_str = content.decode('utf-8', errors='ignore')
-    dangerous_patterns = [
-        (r'<!ENTITY', "External entity declarations not allowed"),
-        (r'<!DOCTYPE.*\[', "Internal DTD subset not allowed"),
-        (r'SYSTEM\s+["\']', "SYSTEM identifiers not allowed"),
-        (r'PUBLIC\s+["\']', "PUBLIC identifiers not allowed"),
-    ]
-    
-    for pattern, message in dangerous_patterns:
-        if re.search(pattern, content_str, re.IGNORECASE):
+    # Check for potential XXE attacks (bytes.lower() folds ASCII only, like re.IGNORECASE on bytes)
+    lowered = content.lower()
+    for pattern, message in _DANGEROUS_PATTERNS:
+        if pattern.search(lowered):
             issues.append(message)
     
     return len(issues) == 0, issues
@@ -496,7 +629,11 @@ def save_audit_result(job_id: str, filename: str, result: IdsAuditResult) -> Non
     job_ids_dir = get_job_ids_dir(job_id)
     audit_path = job_ids_dir / f"{filename}.audit.json"
     
-    with open(audit_path, 'w', encoding='utf-8') as f:
+    if orjson is not None:
+        audit_path.write_bytes(orjson.dumps(result.to_dict(), option=orjson.OPT_INDENT_2))
+        return
+    # json.dump emits many small chunks; a large buffer turns them into one write
+    with open(audit_path, 'w', encoding='utf-8', buffering=_AUDIT_WRITE_BUFFER) as f:
         json.dump(result.to_dict(), f, indent=2)
 
 
@@ -509,8 +646,11 @@ def load_audit_result(job_id: str, filename: str) -> Optional[IdsAuditResult]:
         return None
     
     try:
-        with open(audit_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(audit_path.read_bytes())
+        else:
+            with open(audit_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         result = IdsAuditResult(
             filename=data.get("filename", ""),
@@ -548,27 +688,104 @@ def load_audit_result(job_id: str, filename: str) -> Optional[IdsAuditResult]:
         return None
 
 
+@lru_cache(maxsize=128)
+def _load_ids_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    """Parse an IDS file; mtime_ns and size only key the cache so edited files miss."""
+    try:
+        import ifctester
+        import ifctester.ids
+    except ImportError:
+        # Fall back to lxml parsing
+        return etree.parse(path_str, _get_doc_parser())
+    return ifctester.ids.open(path_str)
+
+
 def load_ids_file(ids_path: Path) -> Optional[Any]:
     """
     Load an IDS file for validation.
     Returns the IDS object if ifctester is available, otherwise returns the lxml tree.
+    Loaded objects are cached by (path, mtime, size) and shared between callers.
     """
-    if not ids_path.exists():
+    try:
+        stat = ids_path.stat()
+    except OSError:
         return None
     
     try:
-        # Try ifctester first
-        try:
-            import ifctester
-            import ifctester.ids
-            return ifctester.ids.open(str(ids_path))
-        except ImportError:
-            # Fall back to lxml parsing
-            return etree.parse(str(ids_path))
+        return _load_ids_cached(str(ids_path), stat.st_mtime_ns, stat.st_size)
     except Exception:
         return None
 
 
+def _release_ids_results(ids_obj: Any) -> None:
+    """Clear per-run results from a (shared, cached) IDS object so it stops pinning the IFC model."""
+    for spec in ids_obj.specifications:
+        spec.reset_status()
+        for facet in spec.requirements:
+            # Every ifctester facet sets passed_entities in Facet.__init__
+            facet.passed_entities.clear()
+
+
+@contextmanager
+def _model_scoped_pset_cache() -> Iterator[None]:
+    """
+    Swap ifctester's property-set lookups for unbounded caches while one model
+    is validated against several IDS files.
+    
+    ifctester memoizes get_pset/get_psets with maxsize=128, which thrashes on
+    any real model, so each IDS file would repeat every lookup. Ids.validate()
+    clears its own references to the original caches, leaving these intact.
+    This relies on ifctester 0.8 internals; other versions use the stock lookups.
+    """
+    try:
+        import ifctester
+        import ifctester.facet as facet_module
+        import ifctester.ids as ids_module
+        originals = (facet_module.get_pset, facet_module.get_psets)
+        supported = (
+            ifctester.__version__.startswith(_PSET_CACHE_IFCTESTER_VERSION)
+            and all(hasattr(cached, "cache_clear") and hasattr(cached, "__wrapped__") for cached in originals)
+            # Ids.validate() must clear the originals through its own bindings
+            and (ids_module.get_pset, ids_module.get_psets) == originals
+        )
+    except (ImportError, AttributeError):
+        supported = False
+    if not supported:
+        yield
+        return
+    
+    unbounded = tuple(lru_cache(maxsize=None)(cached.__wrapped__) for cached in originals)
+    
+    with _PSET_CACHE_LOCK:
+        facet_module.get_pset, facet_module.get_psets = unbounded
+        try:
+            yield
+        finally:
+            facet_module.get_pset, facet_module.get_psets = originals
+
+
+def validate_ifc_against_many_ids(ifc_model: Any, ids_items: list[tuple[str, Any]], ifc_filename: str) -> list[IdsValidationResult]:
+    """
+    Validate one IFC model against several loaded IDS objects.
+    
+    Property-set lookups are shared across all IDS files instead of being
+    recomputed per file.
+    
+    Args:
+        ifc_model: The loaded IFC model (ifcopenshell.file)
+        ids_items: (ids_filename, ids_obj) pairs as returned by load_ids_file
+        ifc_filename: Name of the IFC file being validated
+    
+    Returns:
+        One IdsValidationResult per IDS object, in input order
+    """
+    with _model_scoped_pset_cache():
+        return [
+            validate_ifc_against_ids(ifc_model, ids_obj, ifc_filename, ids_filename)
+            for ids_filename, ids_obj in ids_items
+        ]
+
+
 def validate_ifc_against_ids(ifc_model: Any, ids_obj: Any, ifc_filename: str, ids_filename: str = "unknown.ids") -> IdsValidationResult:
     """
     Validate an IFC model against an IDS specification.
@@ -595,29 +812,27 @@ def validate_ifc_against_ids(ifc_model: Any, ids_obj: Any, ifc_filename: str, id
         # Validate
         ids_obj.validate(ifc_model)
         
-        # Process results
+        # Process results (ifctester.ids.Specification always defines these attributes)
+        spec_results = result.specifications
         for spec in ids_obj.specifications:
-            spec_result = {
+            passed = bool(spec.status)
+            spec_results.append({
                 "name": spec.name or "Unnamed Specification",
-                "description": getattr(spec, 'description', '') or "",
-                "status": "pass" if spec.status else "fail",
-                "applicableCount": len(spec.applicable_entities) if hasattr(spec, 'applicable_entities') else 0,
-            }
-            
-            result.specifications.append(spec_result)
-            result.total_specs += 1
-            
-            if spec.status:
+                "description": spec.description or "",
+                "status": "pass" if passed else "fail",
+                "applicableCount": len(spec.applicable_entities),
+            })
+            if passed:
                 result.passed_specs += 1
-            else:
-                result.failed_specs += 1
+        result.total_specs = len(spec_results)
+        result.failed_specs = result.total_specs - result.passed_specs
     
     except ImportError:
         # ifctester not available - do basic validation with lxml
         if hasattr(ids_obj, 'getroot'):
             root = ids_obj.getroot()
-            ns = {"ids": IDS_NAMESPACE}
-            specs = root.findall(".//ids:specification", ns) or root.findall(".//specification")
+            # iterdescendants walks the tree in C without parsing an ElementPath expression
+            specs = list(root.iterdescendants(_IDS_SPECIFICATION_TAG)) or list(root.iterdescendants("specification"))
             
             for spec in specs:
                 spec_name = spec.get("name", "Unnamed Specification")
@@ -651,4 +866,9 @@ def validate_ifc_against_ids(ifc_model: Any, ids_obj: Any, ifc_filename: str, id
         result.total_specs = 1
         result.failed_specs = 1
     
+    finally:
+        # Also after a failed validate(), which leaves partial results on the cached object
+        if hasattr(ids_obj, "specifications"):
+            _release_ids_results(ids_obj)
+    
     return result
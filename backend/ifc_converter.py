@@ -2,23 +2,105 @@
 IFC to GLB Converter Script
 
 This script converts IFC (Industry Foundation Classes) files to GLB (glTF Binary) format
-using the IfcConvert command-line tool from IfcOpenShell.
+using IfcOpenShell's geometry iterator and glTF serializer in-process, falling back to
+the IfcConvert command-line tool when the Python geometry bindings are unavailable.
 
-The --use-element-guids flag ensures mesh names in the GLB match IFC GlobalIds,
+The use-element-guids setting ensures mesh names in the GLB match IFC GlobalIds,
 which is crucial for linking 3D geometry with BIM data.
 """
 
+import os
 import subprocess
 import sys
 import logging
+from collections import deque
 from pathlib import Path
+from typing import Any
+
+from config import IFC_CONVERT_THREADS
+
+try:
+    import ifcopenshell
+    import ifcopenshell.geom
+except ImportError:
+    ifcopenshell = None
 
 logger = logging.getLogger(__name__)
 
+# IfcConvert skips these by default; the in-process path mirrors that
+_EXCLUDED_ENTITIES = ["IfcSpace", "IfcOpeningElement"]
+
+# Trailing IfcConvert output lines kept for the error message
+_OUTPUT_TAIL_LINES = 20
+
+
+class _NoGeometryError(RuntimeError):
+    """The model has nothing to triangulate; IfcConvert would fail the same way."""
+
+
+def convert_ifc_to_glb_inprocess(ifc_file: Any, output_glb_path: str) -> bool:
+    """
+    Convert an already-loaded IFC model to GLB without spawning IfcConvert.
+
+    Args:
+        ifc_file: The loaded IFC model (ifcopenshell.file).
+        output_glb_path: Path for the output GLB file.
+
+    Returns:
+        True if conversion succeeded.
+
+    Raises:
+        RuntimeError: If the geometry bindings are missing or the model has no geometry.
+    """
+    if ifcopenshell is None:
+        raise RuntimeError("ifcopenshell.geom is not available for in-process conversion")
+
+    output_path = Path(output_glb_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    settings = ifcopenshell.geom.settings()
+    serializer_settings = ifcopenshell.geom.serializer_settings()
+    serializer_settings.set("use-element-guids", True)  # Mesh names will match IFC GlobalIds
+
+    iterator = ifcopenshell.geom.iterator(
+        settings, ifc_file, IFC_CONVERT_THREADS, exclude=_EXCLUDED_ENTITIES
+    )
+    if not iterator.initialize():
+        raise _NoGeometryError(
+            "IFC model has no geometry to convert. "
+            "Check if the IFC file contains valid geometry."
+        )
+
+    # The serializer creates its file immediately, so write beside the target and
+    # swap it in only when complete; a failed run never leaves a partial GLB behind
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    try:
+        # The iterator yields SI units, so the serializer always writes metres
+        serializer = ifcopenshell.geom.serializers.gltf(str(tmp_path), settings, serializer_settings)
+        serializer.setFile(ifc_file)
+        serializer.setUnitNameAndMagnitude("METER", 1.0)
+        serializer.writeHeader()
+        while True:
+            serializer.write(iterator.get())
+            if not iterator.next():
+                break
+        serializer.finalize()
+        del serializer  # Release the file handle before the rename (required on Windows)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    logger.info("Conversion successful! Output size: %s bytes", output_path.stat().st_size)
+    return True
+
 
 def convert_ifc_to_glb(input_ifc_path: str, output_glb_path: str) -> bool:
     """
-    Convert an IFC file to GLB format using IfcConvert.
+    Convert an IFC file to GLB format.
+
+    Uses the in-process geometry bindings when available and falls back to
+    the IfcConvert command-line tool otherwise.
 
     Args:
         input_ifc_path: Path to the input IFC file.
@@ -30,6 +112,21 @@ def convert_ifc_to_glb(input_ifc_path: str, output_glb_path: str) -> bool:
     Raises:
         RuntimeError: If IfcConvert is not found or conversion fails.
     """
+    if ifcopenshell is not None:
+        logger.info("Converting in-process: %s -> %s", input_ifc_path, output_glb_path)
+        try:
+            ifc_file = ifcopenshell.open(input_ifc_path)
+            return convert_ifc_to_glb_inprocess(ifc_file, output_glb_path)
+        except _NoGeometryError:
+            raise
+        except Exception as e:
+            logger.warning("In-process conversion failed, falling back to IfcConvert: %s", e)
+
+    return _convert_with_ifcconvert(input_ifc_path, output_glb_path)
+
+
+def _convert_with_ifcconvert(input_ifc_path: str, output_glb_path: str) -> bool:
+    """Convert an IFC file to GLB by running the IfcConvert command-line tool."""
     input_path = Path(input_ifc_path)
 
     # Ensure output directory exists
@@ -38,9 +135,11 @@ def convert_ifc_to_glb(input_ifc_path: str, output_glb_path: str) -> bool:
 
     # Build the IfcConvert command
     # --use-element-guids: Names meshes after their IFC GlobalIds (crucial for BIM linking)
+    # -j: Triangulates independent elements on multiple threads
     command = [
         "IfcConvert",
         "--use-element-guids",  # Mesh names will match IFC GlobalIds
+        f"-j{IFC_CONVERT_THREADS}",
         str(input_path),
         str(output_path)
     ]
@@ -50,42 +149,43 @@ def convert_ifc_to_glb(input_ifc_path: str, output_glb_path: str) -> bool:
     logger.info("Command: %s", " ".join(command))
 
     try:
-        # Run IfcConvert
-        # Note: On Windows, IfcConvert outputs in UTF-16, so we need special encoding handling
-        result = subprocess.run(
+        # Run IfcConvert, logging its output line by line instead of buffering it.
+        # Note: On Windows, IfcConvert writes UTF-16; decoded as UTF-8 its ASCII text
+        # only gains NUL bytes between characters, which are stripped per line.
+        creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+        tail: deque[str] = deque(maxlen=_OUTPUT_TAIL_LINES)
+        with subprocess.Popen(
             command,
-            capture_output=True,
-            text=False,  # Get bytes, we'll decode manually
-            check=False  # We'll handle errors manually for better messages
-        )
-
-        # Decode output with proper encoding
-        # IfcConvert on Windows uses UTF-16, try multiple encodings
-        stdout_text = ""
-        stderr_text = ""
-        
-        for encoding in ['utf-16', 'utf-8', 'cp1252']:
-            try:
-                stdout_text = result.stdout.decode(encoding) if result.stdout else ""
-                stderr_text = result.stderr.decode(encoding) if result.stderr else ""
-                break
-            except (UnicodeDecodeError, AttributeError):
-                continue
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            creationflags=creationflags,
+        ) as proc:
+            for line in proc.stdout:
+                line = line.replace("\x00", "").rstrip()
+                if line:
+                    logger.info("IfcConvert: %s", line)
+                    tail.append(line)
+            returncode = proc.wait()
 
         # Check for errors
         # Note: IfcConvert return code can be non-zero even for successful conversions
         # We'll verify by checking if output file exists instead
-        if result.returncode != 0:
-            error_msg = stderr_text if stderr_text else stdout_text
-            # Only raise if output file doesn't exist (true error)
-            if not output_path.exists():
+        if returncode != 0:
+            # Only raise if no output file was written (true error)
+            if not output_path.exists() or output_path.stat().st_size == 0:
+                output_path.unlink(missing_ok=True)
+                error_msg = "\n".join(tail)
                 raise RuntimeError(
-                    f"IfcConvert failed with return code {result.returncode}.\n"
+                    f"IfcConvert failed with return code {returncode}.\n"
                     f"Error output: {error_msg}"
                 )
 
-        # Verify output file was created
-        if not output_path.exists():
+        # Verify output file was created (an empty file is a failed conversion too)
+        if not output_path.exists() or output_path.stat().st_size == 0:
+            output_path.unlink(missing_ok=True)
             raise RuntimeError(
                 "IfcConvert completed but output file was not created. "
                 "Check if the IFC file contains valid geometry."
@@ -93,13 +193,6 @@ def convert_ifc_to_glb(input_ifc_path: str, output_glb_path: str) -> bool:
 
         file_size = output_path.stat().st_size
         logger.info("Conversion successful! Output size: %s bytes", file_size)
-        
-        # Log IfcConvert output for debugging
-        if stdout_text:
-            logger.info("IfcConvert stdout: %s", stdout_text[:200])
-        if stderr_text:
-            logger.info("IfcConvert stderr: %s", stderr_text[:200])
-        
         return True
 
     except FileNotFoundError:
@@ -14,15 +14,36 @@ import ifcopenshell
 import ifcopenshell.util.element
 import json
 import math
+import multiprocessing
+import os
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+from config import METADATA_EXTRACT_WORKERS, METADATA_PARALLEL_MAX_FILE_MB
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Current metadata schema version
 METADATA_SCHEMA_VERSION = 2
 logger = logging.getLogger(__name__)
 
+# Below this many products, opening the file again in every worker costs more than it saves
+_PARALLEL_MIN_PRODUCTS = 5000
+# Products per worker task; large enough to amortise pickling the results back
+_WORKER_CHUNK_SIZE = 256
+# Rough in-memory size of an opened model relative to its .ifc file, used to budget workers
+_LOADED_SIZE_FACTOR = 10
+
+# The IFC model and its relationship indexes, set up once per worker process by _init_worker
+_worker_ifc_file = None
+_worker_indexes = None
+
 
 def get_property_sets(element) -> dict[str, dict[str, Any]]:
     """
@@ -113,11 +134,10 @@ def extract_project_orientation(ifc_file) -> dict:
         
         for ctx in contexts:
             # Skip sub-contexts, look for top-level Model context
-            if hasattr(ctx, 'ContextType') and ctx.ContextType == "Model":
-                # Prefer contexts that aren't sub-contexts
-                if not hasattr(ctx, 'ParentContext') or ctx.ParentContext is None:
-                    model_context = ctx
-                    break
+            # (only sub-contexts define ParentContext)
+            if getattr(ctx, 'ContextType', None) == "Model" and getattr(ctx, 'ParentContext', None) is None:
+                model_context = ctx
+                break
         
         # Fallback: use first context if no explicit Model context
         if model_context is None and contexts:
@@ -134,9 +154,11 @@ def extract_project_orientation(ifc_file) -> dict:
             return orientation
         
         # Get RefDirection (X-axis) - defaults to (1,0,0) if not specified
-        ref_direction = getattr(wcs, 'RefDirection', None)
-        if ref_direction is not None and hasattr(ref_direction, 'DirectionRatios'):
-            ratios = ref_direction.DirectionRatios
+        try:
+            ratios = wcs.RefDirection.DirectionRatios
+        except AttributeError:
+            ratios = None
+        if ratios is not None:
             ref_x = float(ratios[0]) if len(ratios) > 0 else 1.0
             ref_y = float(ratios[1]) if len(ratios) > 1 else 0.0
             
@@ -151,9 +173,11 @@ def extract_project_orientation(ifc_file) -> dict:
             logger.info("RefDirection not specified, using default (1,0,0)")
         
         # Extract TrueNorth if present
-        true_north = getattr(model_context, 'TrueNorth', None)
-        if true_north is not None and hasattr(true_north, 'DirectionRatios'):
-            ratios = true_north.DirectionRatios
+        try:
+            ratios = model_context.TrueNorth.DirectionRatios
+        except AttributeError:
+            ratios = None
+        if ratios is not None:
             tn_x = float(ratios[0]) if len(ratios) > 0 else 0.0
             tn_y = float(ratios[1]) if len(ratios) > 1 else 1.0
             
@@ -182,19 +206,53 @@ def get_element_location(element) -> dict[str, float] | None:
         Dictionary with x, y, z coordinates or None
     """
     try:
-        placement = element.ObjectPlacement
-        if placement and hasattr(placement, 'RelativePlacement'):
-            rel_placement = placement.RelativePlacement
-            if hasattr(rel_placement, 'Location') and rel_placement.Location:
-                coords = rel_placement.Location.Coordinates
-                return {
-                    'x': float(coords[0]),
-                    'y': float(coords[1]),
-                    'z': float(coords[2]) if len(coords) > 2 else 0.0
-                }
+        # A missing placement, grid placement or unset Location all raise AttributeError
+        coords = element.ObjectPlacement.RelativePlacement.Location.Coordinates
+        return {
+            'x': float(coords[0]),
+            'y': float(coords[1]),
+            'z': float(coords[2]) if len(coords) > 2 else 0.0
+        }
+    except Exception:
+        return None
+
+
+def _material_names(material, expanded: dict[int, list[str]] | None = None) -> list[str]:
+    """
+    Expand one RelatingMaterial (material, layer set, usage or list) into material names.
+    
+    Layer sets and material lists are usually shared by many elements; pass an
+    expanded dict to reuse each one's names by STEP id instead of walking it again.
+    """
+    names = []
+    try:
+        if material.is_a('IfcMaterial'):
+            names.append(material.Name)
+        elif material.is_a('IfcMaterialLayerSetUsage'):
+            names.extend(_expand_material_set(material.ForLayerSet, expanded))
+        elif material.is_a('IfcMaterialLayerSet') or material.is_a('IfcMaterialList'):
+            names.extend(_expand_material_set(material, expanded))
     except Exception:
         pass
-    return None
+    return names
+
+
+def _expand_material_set(material_set, expanded: dict[int, list[str]] | None) -> list[str]:
+    """Material names of an IfcMaterialLayerSet or IfcMaterialList, memoized in expanded."""
+    key = material_set.id()
+    if expanded is not None and key in expanded:
+        return expanded[key]
+    names = []
+    if material_set.is_a('IfcMaterialLayerSet'):
+        for layer in material_set.MaterialLayers:
+            if layer.Material:
+                names.append(layer.Material.Name)
+    else:
+        for mat in material_set.Materials:
+            names.append(mat.Name)
+    if expanded is not None:
+        expanded[key] = names
+    return names
 
 
 def get_element_materials(element) -> list[str]:
@@ -209,25 +267,10 @@ def get_element_materials(element) -> list[str]:
     """
     materials = []
     try:
-        # Get material associations
-        if hasattr(element, 'HasAssociations'):
-            for association in element.HasAssociations:
-                if association.is_a('IfcRelAssociatesMaterial'):
-                    material = association.RelatingMaterial
-                    if material.is_a('IfcMaterial'):
-                        materials.append(material.Name)
-                    elif material.is_a('IfcMaterialLayerSetUsage'):
-                        layer_set = material.ForLayerSet
-                        for layer in layer_set.MaterialLayers:
-                            if layer.Material:
-                                materials.append(layer.Material.Name)
-                    elif material.is_a('IfcMaterialLayerSet'):
-                        for layer in material.MaterialLayers:
-                            if layer.Material:
-                                materials.append(layer.Material.Name)
-                    elif material.is_a('IfcMaterialList'):
-                        for mat in material.Materials:
-                            materials.append(mat.Name)
+        # Get material associations (AttributeError if the class has none)
+        for association in element.HasAssociations:
+            if association.is_a('IfcRelAssociatesMaterial'):
+                materials.extend(_material_names(association.RelatingMaterial))
     except Exception:
         pass
     return materials
@@ -244,53 +287,157 @@ def get_containing_storey(element) -> str | None:
         Name of the containing storey or None
     """
     try:
-        # Check spatial containment
-        if hasattr(element, 'ContainedInStructure'):
-            for rel in element.ContainedInStructure:
-                structure = rel.RelatingStructure
-                if structure.is_a('IfcBuildingStorey'):
-                    return structure.Name
+        # Check spatial containment (AttributeError if the class has none)
+        for rel in element.ContainedInStructure:
+            structure = rel.RelatingStructure
+            if structure.is_a('IfcBuildingStorey'):
+                return structure.Name
     except Exception:
         pass
     return None
 
 
-def extract_metadata(ifc_path: str, original_filename: str = None) -> dict:
+def _build_storey_index(ifc_file) -> dict[int, str | None]:
     """
-    Extract metadata from all IfcProduct entities in an IFC file.
+    Map product STEP ids to their containing storey's name in one pass.
     
-    Returns a wrapped structure with schema version, orientation, and elements.
+    Equivalent to get_containing_storey for every product, without walking
+    each product's ContainedInStructure inverse.
+    """
+    index = {}
+    # Only classes that declare the inverse (not e.g. IfcSpace) count, as in get_containing_storey
+    declares_inverse: dict[str, bool] = {}
+    for rel in ifc_file.by_type('IfcRelContainedInSpatialStructure'):
+        structure = rel.RelatingStructure
+        if structure is None or not structure.is_a('IfcBuildingStorey'):
+            continue
+        for element in rel.RelatedElements:
+            ifc_class = element.is_a()
+            declared = declares_inverse.get(ifc_class)
+            if declared is None:
+                declared = declares_inverse[ifc_class] = hasattr(element, 'ContainedInStructure')
+            if declared:
+                index.setdefault(element.id(), structure.Name)
+    return index
+
+
+def _build_material_index(ifc_file) -> dict[int, list[str]]:
+    """
+    Map object STEP ids to their material names in one pass.
     
-    Args:
-        ifc_path: Path to the IFC file
-        original_filename: Original name of the uploaded file (optional)
-        
-    Returns:
-        Dictionary with structure:
-        {
-            "schemaVersion": 2,
-            "ifcSchema": "IFC2X3",
-            "fileName": "model.ifc",
-            "orientation": { modelYawDeg, trueNorthDeg, orientationSource },
-            "elements": { GlobalId -> element data }
-        }
+    Equivalent to get_element_materials for every product, without walking
+    each product's HasAssociations inverse.
     """
-    logger.info(f"Loading IFC file: {ifc_path}")
-    ifc_file = ifcopenshell.open(ifc_path)
+    index: dict[int, list[str]] = {}
+    expanded: dict[int, list[str]] = {}
+    for rel in ifc_file.by_type('IfcRelAssociatesMaterial'):
+        names = _material_names(rel.RelatingMaterial, expanded)
+        for obj in rel.RelatedObjects:
+            index.setdefault(obj.id(), []).extend(names)
+    return index
+
+
+def _extract_element(element, storey_index: dict, material_index: dict) -> tuple[str, dict]:
+    """Build the (GlobalId, element data) entry for one IfcProduct."""
+    step_id = element.id()
+    # Build element data, adding only keys with a value (no None, [] or {}) for cleaner output.
+    # Every IfcProduct has Name and Description (IfcRoot) and ObjectType (IfcObject).
+    element_data = {'type': element.is_a()}
+    name = element.Name
+    if name is not None:
+        element_data['name'] = name
+    description = element.Description
+    if description is not None:
+        element_data['description'] = description
+    object_type = element.ObjectType
+    if object_type is not None:
+        element_data['objectType'] = object_type
+    storey = storey_index.get(step_id)
+    if storey is not None:
+        element_data['storey'] = storey
+    materials = material_index.get(step_id)
+    if materials:
+        element_data['materials'] = materials
+    location = get_element_location(element)
+    if location is not None:
+        element_data['location'] = location
+    properties = get_property_sets(element)
+    if properties:
+        element_data['properties'] = properties
     
-    # Extract project orientation first
-    logger.info("Extracting project orientation...")
-    orientation = extract_project_orientation(ifc_file)
+    return element.GlobalId, element_data
+
+
+def _init_worker(ifc_path: str) -> None:
+    """Open the IFC file and index its relationships once in each worker process."""
+    global _worker_ifc_file, _worker_indexes
+    _worker_ifc_file = ifcopenshell.open(ifc_path)
+    _worker_indexes = (_build_storey_index(_worker_ifc_file), _build_material_index(_worker_ifc_file))
+
+
+def _extract_chunk(step_ids: list[int]) -> list[tuple[str, dict]]:
+    """Extract a slice of products, addressed by STEP id, in a worker process."""
+    by_id = _worker_ifc_file.by_id
+    storey_index, material_index = _worker_indexes
+    return [_extract_element(by_id(step_id), storey_index, material_index) for step_id in step_ids]
+
+
+def _available_memory() -> int | None:
+    """Available physical memory in bytes, or None where the platform does not report it."""
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _parallel_workers(ifc_path: str, total: int) -> int:
+    """
+    Number of worker processes to extract this model with, or 0 to stay in-process.
     
-    # Extract schema and filename
-    ifc_schema = ifc_file.schema
-    file_name = original_filename if original_filename else Path(ifc_path).name
+    Every worker loads the whole model, so large files and low free memory
+    fall back to fewer workers or a single process.
+    """
+    if METADATA_EXTRACT_WORKERS <= 1 or total < _PARALLEL_MIN_PRODUCTS:
+        return 0
+    file_size = os.path.getsize(ifc_path)
+    if file_size > METADATA_PARALLEL_MAX_FILE_MB * 1024 * 1024:
+        logger.info(f"IFC file is larger than {METADATA_PARALLEL_MAX_FILE_MB} MB, extracting in one process")
+        return 0
+    workers = min(METADATA_EXTRACT_WORKERS, math.ceil(total / _WORKER_CHUNK_SIZE))
+    available = _available_memory()
+    if available is not None:
+        workers = min(workers, available // max(1, file_size * _LOADED_SIZE_FACTOR))
+    return workers if workers > 1 else 0
+
+
+def _iter_elements_parallel(ifc_path: str, step_ids: list[int], workers: int) -> Iterator[tuple[str, dict]]:
+    """Fan product extraction, addressed by STEP id, out over worker processes."""
+    chunks = [step_ids[i:i + _WORKER_CHUNK_SIZE] for i in range(0, len(step_ids), _WORKER_CHUNK_SIZE)]
+    total = len(step_ids)
     
-    elements = {}
-    products = ifc_file.by_type('IfcProduct')
+    logger.info(f"Extracting with {workers} worker processes...")
+    done = 0
+    # spawn: the caller may be a threaded server, which fork does not copy safely
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(ifc_path,),
+    ) as executor:
+        # map yields chunks in submission order, so elements keep the file's product order
+        for chunk in executor.map(_extract_chunk, chunks):
+            yield from chunk
+            done += len(chunk)
+            logger.info(f"Processed {done}/{total} elements ({done*100//total}%)")
+
+
+def _iter_elements(ifc_file, products: list) -> Iterator[tuple[str, dict]]:
+    """Yield (GlobalId, element data) for every product, in file order, in this process."""
     total = len(products)
     
-    logger.info(f"Processing {total} IfcProduct entities...")
+    # Containment and material relationships are indexed once instead of per product
+    storey_index = _build_storey_index(ifc_file)
+    material_index = _build_material_index(ifc_file)
     
     for i, element in enumerate(products, 1):
         # Skip spatial elements like IfcSite, IfcBuilding (optional)
@@ -298,38 +445,129 @@ def extract_metadata(ifc_path: str, original_filename: str = None) -> dict:
         # if element.is_a('IfcSpatialStructureElement'):
         #     continue
         
-        global_id = element.GlobalId
-        
-        # Build element data
-        element_data = {
-            'type': element.is_a(),
-            'name': element.Name if hasattr(element, 'Name') else None,
-            'description': element.Description if hasattr(element, 'Description') else None,
-            'objectType': element.ObjectType if hasattr(element, 'ObjectType') else None,
-            'storey': get_containing_storey(element),
-            'materials': get_element_materials(element),
-            'location': get_element_location(element),
-            'properties': get_property_sets(element)
-        }
-        
-        # Remove None values for cleaner output
-        element_data = {k: v for k, v in element_data.items() 
-                       if v is not None and v != [] and v != {}}
-        
-        elements[global_id] = element_data
+        yield _extract_element(element, storey_index, material_index)
         
         # Progress indicator
         if i % 100 == 0 or i == total:
             logger.info(f"Processed {i}/{total} elements ({i*100//total}%)")
+
+
+def _open_metadata(ifc_path: str, original_filename: str | None) -> tuple[dict, Iterator[tuple[str, dict]]]:
+    """Open the IFC file and return the metadata header (no elements) and an element iterator."""
+    logger.info(f"Loading IFC file: {ifc_path}")
+    ifc_file = ifcopenshell.open(ifc_path)
     
-    # Return wrapped structure with schema version
-    return {
+    # Extract project orientation first
+    logger.info("Extracting project orientation...")
+    orientation = extract_project_orientation(ifc_file)
+    
+    # Extract schema and filename
+    ifc_schema = ifc_file.schema
+    file_name = original_filename if original_filename else Path(ifc_path).name
+    
+    header = {
         "schemaVersion": METADATA_SCHEMA_VERSION,
         "ifcSchema": ifc_schema,
         "fileName": file_name,
         "orientation": orientation,
-        "elements": elements
     }
+    
+    products = ifc_file.by_type('IfcProduct')
+    logger.info(f"Processing {len(products)} IfcProduct entities...")
+    workers = _parallel_workers(ifc_path, len(products))
+    if workers:
+        step_ids = [product.id() for product in products]
+        # Workers open their own copies; only the STEP ids are needed here
+        del products, ifc_file
+        return header, _iter_elements_parallel(ifc_path, step_ids, workers)
+    return header, _iter_elements(ifc_file, products)
+
+
+def extract_metadata(ifc_path: str, original_filename: str = None) -> dict:
+    """
+    Extract metadata from all IfcProduct entities in an IFC file.
+    
+    Returns a wrapped structure with schema version, orientation, and elements.
+    Large models are extracted on METADATA_EXTRACT_WORKERS processes.
+    Use extract_metadata_to_file to write the JSON without holding every element.
+    
+    Args:
+        ifc_path: Path to the IFC file
+        original_filename: Original name of the uploaded file (optional)
+        
+    Returns:
+        Dictionary with structure:
+        {
+            "schemaVersion": 2,
+            "ifcSchema": "IFC2X3",
+            "fileName": "model.ifc",
+            "orientation": { modelYawDeg, trueNorthDeg, orientationSource },
+            "elements": { GlobalId -> element data }
+        }
+    """
+    metadata, elements = _open_metadata(ifc_path, original_filename)
+    metadata["elements"] = dict(elements)
+    return metadata
+
+
+def extract_metadata_to_file(ifc_path: str, output_path: str, original_filename: str = None) -> dict:
+    """
+    Extract metadata and stream it straight to a JSON file.
+    
+    Elements are written as they are extracted, so memory stays flat
+    regardless of model size. The file matches save_metadata(extract_metadata(...)).
+    
+    Args:
+        ifc_path: Path to the IFC file
+        output_path: Path for the output JSON file
+        original_filename: Original name of the uploaded file (optional)
+        
+    Returns:
+        The metadata header (schemaVersion, ifcSchema, fileName, orientation),
+        without elements
+    """
+    header, elements = _open_metadata(ifc_path, original_filename)
+    _write_metadata(header, elements, output_path)
+    return header
+
+
+def _dumps(value: Any) -> bytes:
+    """Serialize compact UTF-8 JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _write_metadata(header: dict, elements: Iterable[tuple[str, dict]], output_path: str) -> None:
+    """Write the wrapped metadata JSON one element at a time."""
+    output_file = Path(output_path)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Written beside the target and swapped in, so a failed run never leaves half a file
+    tmp_file = output_file.with_suffix(output_file.suffix + ".tmp")
+    element_count = 0
+    try:
+        with open(tmp_file, 'wb') as f:
+            # Header fields first, then an "elements" object filled in as entries arrive
+            head = _dumps(header)
+            f.write(head[:-1] + (b',' if header else b'') + b'"elements":{')
+            for global_id, element_data in elements:
+                if element_count:
+                    f.write(b',')
+                f.write(_dumps(global_id))
+                f.write(b':')
+                f.write(_dumps(element_data))
+                element_count += 1
+            f.write(b'}}')
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    
+    logger.info(f"Metadata saved to: {output_path}")
+    logger.info(f"Schema version: {header.get('schemaVersion', 1)}")
+    logger.info(f"Total elements: {element_count}")
+    logger.info(f"File size: {output_file.stat().st_size / 1024:.1f} KB")
 
 
 def save_metadata(metadata: dict, output_path: str) -> None:
@@ -340,18 +578,20 @@ def save_metadata(metadata: dict, output_path: str) -> None:
         metadata: The metadata dictionary (wrapped structure with schemaVersion)
         output_path: Path for the output JSON file
     """
+    if "elements" in metadata:
+        header = {key: value for key, value in metadata.items() if key != "elements"}
+        _write_metadata(header, metadata["elements"].items(), output_path)
+        return
+    
+    # Old flat format (GlobalId -> element data)
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
-    
-    # Count elements (handle both old flat format and new wrapped format)
-    element_count = len(metadata.get("elements", metadata))
+    output_file.write_bytes(_dumps(metadata))
     
     logger.info(f"Metadata saved to: {output_path}")
     logger.info(f"Schema version: {metadata.get('schemaVersion', 1)}")
-    logger.info(f"Total elements: {element_count}")
+    logger.info(f"Total elements: {len(metadata)}")
     logger.info(f"File size: {output_file.stat().st_size / 1024:.1f} KB")
 
 
@@ -369,9 +609,8 @@ def main():
     output_file = sys.argv[2]
     
     try:
-        # Extract and save metadata
-        metadata = extract_metadata(input_file)
-        save_metadata(metadata, output_file)
+        # Extract and stream metadata to disk
+        extract_metadata_to_file(input_file, output_file)
         logger.info("Done!")
         sys.exit(0)
     except Exception as e:
@@ -23,7 +23,7 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 import asyncio
 
 # Import our conversion modules
-from ifc_metadata_extractor import extract_metadata, save_metadata, METADATA_SCHEMA_VERSION
+from ifc_metadata_extractor import extract_metadata_to_file, METADATA_SCHEMA_VERSION
 from ec_api import router as ec_router
 from fm_api import router as fm_router
 from occupancy_api import router as occupancy_router
@@ -687,8 +687,7 @@ async def upgrade_metadata_schema(
     # Re-extract metadata with latest schema
     try:
         logger.info("[%s] Upgrading metadata to schema v%s...", job_id, METADATA_SCHEMA_VERSION)
-        metadata = extract_metadata(str(ifc_path))
-        save_metadata(metadata, str(metadata_path))
+        metadata = extract_metadata_to_file(str(ifc_path), str(metadata_path))
         
         return {
             "job_id": job_id,
@@ -7,16 +7,27 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from config import GRAPH_BACKEND, NEO4J_DATABASE, NEO4J_PASSWORD, NEO4J_URI, NEO4J_USER
+from config import (
+    GRAPH_BACKEND,
+    NEO4J_ACQUIRE_TIMEOUT,
+    NEO4J_DATABASE,
+    NEO4J_MAX_CONNECTION_LIFETIME,
+    NEO4J_PASSWORD,
+    NEO4J_POOL_SIZE,
+    NEO4J_URI,
+    NEO4J_USER,
+)
 
 logger = logging.getLogger(__name__)
 
 try:
-    from neo4j import Driver, GraphDatabase
+    from neo4j import READ_ACCESS, Driver, GraphDatabase, Query
     _neo4j_import_error: Exception | None = None
 except Exception as exc:
     Driver = Any  # type: ignore[assignment]
     GraphDatabase = None
+    Query = None
+    READ_ACCESS = "READ"
     _neo4j_import_error = exc
 
 _driver: Driver | None = None
@@ -28,6 +39,9 @@ def initialize_neo4j() -> None:
 
     if GRAPH_BACKEND != "neo4j":
         return
+    if _driver is not None:
+        # One driver (and so one connection pool) per process.
+        return
 
     if GraphDatabase is None:
         extra = f" Import error: {_neo4j_import_error}" if _neo4j_import_error else ""
@@ -41,7 +55,14 @@ def initialize_neo4j() -> None:
 
     auth = (NEO4J_USER, NEO4J_PASSWORD) if NEO4J_USER else None
     try:
-        _driver = GraphDatabase.driver(NEO4J_URI, auth=auth)
+        _driver = GraphDatabase.driver(
+            NEO4J_URI,
+            auth=auth,
+            max_connection_pool_size=NEO4J_POOL_SIZE,
+            max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+            connection_acquisition_timeout=NEO4J_ACQUIRE_TIMEOUT,
+            keep_alive=True,
+        )
         _driver.verify_connectivity()
         logger.info("Neo4j connectivity verified for database '%s'.", NEO4J_DATABASE)
     except Exception as exc:
@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Optional
 
 from ifc_converter import convert_ifc_to_glb
-from ifc_metadata_extractor import extract_metadata, save_metadata, METADATA_SCHEMA_VERSION
+from ifc_metadata_extractor import extract_metadata_to_file, save_metadata, METADATA_SCHEMA_VERSION
 from ifc_spatial_hierarchy import extract_spatial_hierarchy, save_hierarchy
 from fm_sidecar_merger import find_fm_sidecar, merge_fm_sidecar
 from config import GRAPH_BACKEND, OUTPUT_DIR
@@ -80,10 +80,12 @@ async def process_ifc_file(
         job.stage = JobStage.EXTRACTING_METADATA
         logger.info("[%s] Extracting metadata (schema v%s)...", job_id, METADATA_SCHEMA_VERSION)
         try:
+            # Elements are streamed to metadata.json; only the header comes back
             metadata = await loop.run_in_executor(
                 None,
-                extract_metadata,
+                extract_metadata_to_file,
                 str(ifc_path),
+                str(metadata_path),
                 job.ifc_filename
             )
 
@@ -95,13 +97,6 @@ async def process_ifc_file(
                     ifc_schema=job.ifc_schema,
                 )
 
-            await loop.run_in_executor(
-                None,
-                save_metadata,
-                metadata,
-                str(metadata_path)
-            )
-
             # 2b. Merge FM sidecar if present (explicit path or auto-discovered)
             fm_sidecar = sidecar_path  # Use explicit path if provided
             if not fm_sidecar:
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+try:
+    import ifcopenshell
+    import ifcopenshell.api
+    import ifcopenshell.api.project
+    import ifctester
+    import ifctester.facet
+    import ifctester.ids
+except ImportError:  # pragma: no cover - depends on environment
+    ifctester = None
+
+
+def _build_sample_model():
+    run = ifcopenshell.api.run
+    model = ifcopenshell.api.project.create_file(version="IFC4")
+    project = run("root.create_entity", model, ifc_class="IfcProject", name="Project")
+    run("unit.assign_unit", model)
+    storey = run("root.create_entity", model, ifc_class="IfcBuildingStorey", name="Level 1")
+    run("aggregate.assign_object", model, products=[storey], relating_object=project)
+    for index in range(6):
+        wall = run("root.create_entity", model, ifc_class="IfcWall", name=f"Wall {index}")
+        run("spatial.assign_container", model, products=[wall], relating_structure=storey)
+        pset = run("pset.add_pset", model, product=wall, name="Pset_WallCommon")
+        run(
+            "pset.edit_pset",
+            model,
+            pset=pset,
+            properties={"Reference": f"W{index}", "IsExternal": bool(index % 2)},
+        )
+    for index in range(2):
+        run("root.create_entity", model, ifc_class="IfcSlab", name=f"Slab {index}")
+    return model
+
+
+def _property_spec(name: str, entity: str, base_name: str, value=None, cardinality: str = "required"):
+    spec = ifctester.ids.Specification(name=name, ifcVersion=["IFC4"])
+    spec.applicability.append(ifctester.facet.Entity(name=entity))
+    spec.requirements.append(
+        ifctester.facet.Property(
+            propertySet="Pset_WallCommon" if entity == "IFCWALL" else "Pset_SlabCommon",
+            baseName=base_name,
+            value=value,
+            cardinality=cardinality,
+        )
+    )
+    return spec
+
+
+def _build_ids_items() -> list:
+    references = ifctester.ids.Ids(title="References")
+    references.specifications.append(_property_spec("Walls have a reference", "IFCWALL", "Reference"))
+    references.specifications.append(_property_spec("Slabs have a reference", "IFCSLAB", "Reference"))
+
+    external = ifctester.ids.Ids(title="External walls")
+    external.specifications.append(_property_spec("Walls are external", "IFCWALL", "IsExternal", value="TRUE"))
+    external.specifications.append(
+        _property_spec("Slabs have no load bearing flag", "IFCSLAB", "LoadBearing", cardinality="prohibited")
+    )
+    return [("references.ids", references), ("external.ids", external)]
+
+
+@unittest.skipIf(ifctester is None, "ifctester is not installed")
+class ManyIdsValidationTests(unittest.TestCase):
+    def setUp(self):
+        import ids_manager
+
+        self.ids_manager = ids_manager
+        self.model = _build_sample_model()
+        self.ids_items = _build_ids_items()
+
+    def _validate_each(self) -> list[dict]:
+        return [
+            self.ids_manager.validate_ifc_against_ids(self.model, ids_obj, "sample.ifc", ids_filename).to_dict()
+            for ids_filename, ids_obj in self.ids_items
+        ]
+
+    def test_many_ids_matches_per_file_validation(self):
+        expected = self._validate_each()
+        results = self.ids_manager.validate_ifc_against_many_ids(self.model, self.ids_items, "sample.ifc")
+
+        self.assertEqual([result.to_dict() for result in results], expected)
+        statuses = [spec["status"] for result in expected for spec in result["specifications"]]
+        self.assertEqual(statuses, ["pass", "fail", "fail", "pass"])
+
+    def test_pset_caches_are_swapped_and_restored(self):
+        originals = (ifctester.facet.get_pset, ifctester.facet.get_psets)
+        with self.ids_manager._model_scoped_pset_cache():
+            self.assertIsNone(ifctester.facet.get_pset.cache_info().maxsize)
+            self.assertIsNone(ifctester.facet.get_psets.cache_info().maxsize)
+        self.assertEqual((ifctester.facet.get_pset, ifctester.facet.get_psets), originals)
+
+    def test_unsupported_ifctester_version_uses_stock_lookups(self):
+        originals = (ifctester.facet.get_pset, ifctester.facet.get_psets)
+        with mock.patch.object(ifctester, "__version__", "99.0.0"):
+            with self.ids_manager._model_scoped_pset_cache():
+                self.assertEqual((ifctester.facet.get_pset, ifctester.facet.get_psets), originals)
+            results = self.ids_manager.validate_ifc_against_many_ids(self.model, self.ids_items, "sample.ifc")
+        self.assertEqual([result.to_dict() for result in results], self._validate_each())
+
+
+if __name__ == "__main__":
+    unittest.main()
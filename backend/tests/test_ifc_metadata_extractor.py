@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import unittest
+import uuid
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+try:
+    import ifcopenshell
+    import ifcopenshell.api
+    import ifcopenshell.api.project
+except ImportError:  # pragma: no cover - depends on environment
+    ifcopenshell = None
+
+
+def _build_sample_ifc(path: Path) -> None:
+    run = ifcopenshell.api.run
+    model = ifcopenshell.api.project.create_file(version="IFC4")
+    project = run("root.create_entity", model, ifc_class="IfcProject", name="Project")
+    run("unit.assign_unit", model)
+    run("context.add_context", model, context_type="Model")
+    site = run("root.create_entity", model, ifc_class="IfcSite", name="Site")
+    building = run("root.create_entity", model, ifc_class="IfcBuilding", name="Building")
+    storey = run("root.create_entity", model, ifc_class="IfcBuildingStorey", name="Level 1")
+    run("aggregate.assign_object", model, products=[site], relating_object=project)
+    run("aggregate.assign_object", model, products=[building], relating_object=site)
+    run("aggregate.assign_object", model, products=[storey], relating_object=building)
+
+    concrete = run("material.add_material", model, name="Concrete")
+    for index in range(3):
+        wall = run("root.create_entity", model, ifc_class="IfcWall", name=f"Wall {index}")
+        run("spatial.assign_container", model, products=[wall], relating_structure=storey)
+        run("material.assign_material", model, products=[wall], material=concrete)
+        pset = run("pset.add_pset", model, product=wall, name="Pset_WallCommon")
+        run(
+            "pset.edit_pset",
+            model,
+            pset=pset,
+            properties={"Reference": f"W{index}", "IsExternal": bool(index % 2), "Width": 0.2},
+        )
+    model.write(str(path))
+
+
+@unittest.skipIf(ifcopenshell is None, "ifcopenshell is not installed")
+class MetadataWriterTests(unittest.TestCase):
+    def setUp(self):
+        import ifc_metadata_extractor
+
+        self.extractor = ifc_metadata_extractor
+        self._tmp_dir = BACKEND_DIR / "tests" / ".tmp" / f"metadata_{uuid.uuid4().hex}"
+        self._tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def test_streamed_file_matches_extract_metadata(self):
+        ifc_path = self._tmp_dir / "sample.ifc"
+        _build_sample_ifc(ifc_path)
+        output_path = self._tmp_dir / "metadata.json"
+
+        header = self.extractor.extract_metadata_to_file(ifc_path, output_path, "sample.ifc")
+        expected = self.extractor.extract_metadata(ifc_path, "sample.ifc")
+
+        with open(output_path, encoding="utf-8") as handle:
+            written = json.load(handle)
+        self.assertEqual(written, expected)
+        self.assertNotIn("elements", header)
+        self.assertEqual(header, {key: value for key, value in expected.items() if key != "elements"})
+        walls = [element for element in written["elements"].values() if element["type"] == "IfcWall"]
+        self.assertEqual(len(walls), 3)
+        self.assertFalse(output_path.with_suffix(output_path.suffix + ".tmp").exists())
+
+    def test_empty_header_and_elements_are_valid_json(self):
+        output_path = self._tmp_dir / "metadata.json"
+
+        self.extractor._write_metadata({}, [], output_path)
+        with open(output_path, encoding="utf-8") as handle:
+            self.assertEqual(json.load(handle), {"elements": {}})
+
+        self.extractor.save_metadata({"schemaVersion": 2, "elements": {}}, output_path)
+        with open(output_path, encoding="utf-8") as handle:
+            self.assertEqual(json.load(handle), {"schemaVersion": 2, "elements": {}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,9 +45,9 @@ try:
         list_uploaded_ids_files,
         list_default_ids_files,
         get_ids_info,
-        validate_ids_xml_structure,
         load_ids_file,
         validate_ifc_against_ids,
+        validate_ifc_against_many_ids,
         list_all_ids_templates,
         get_job_ids_dir,
         # New multi-gate validation
@@ -65,9 +65,9 @@ except ModuleNotFoundError as exc:
     list_uploaded_ids_files = None  # type: ignore[assignment]
     list_default_ids_files = None  # type: ignore[assignment]
     get_ids_info = None  # type: ignore[assignment]
-    validate_ids_xml_structure = None  # type: ignore[assignment]
     load_ids_file = None  # type: ignore[assignment]
     validate_ifc_against_ids = None  # type: ignore[assignment]
+    validate_ifc_against_many_ids = None  # type: ignore[assignment]
     list_all_ids_templates = None  # type: ignore[assignment]
     get_job_ids_dir = None  # type: ignore[assignment]
     validate_ids_file = None  # type: ignore[assignment]
@@ -838,6 +838,7 @@ async def validate_against_ids(
             results.append(result.to_dict())
     else:
         # Validate against all IDS files that pass audit
+        ids_files = []
         # Check uploaded files for audit status
         for ids_file in list_uploaded_ids_files(job_id):
             if not skip_audit_check:
@@ -848,18 +849,21 @@ async def validate_against_ids(
                         "reason": "Failed audit validation",
                     })
                     continue
-            
-            ids_obj = load_ids_file(ids_file)
-            if ids_obj:
-                result = validate_ifc_against_ids(ifc_model, ids_obj, ifc_path.name, ids_file.name)
-                results.append(result.to_dict())
+            ids_files.append(ids_file)
         
         # Always include defaults (they're trusted)
-        for ids_file in list_default_ids_files():
-            ids_obj = load_ids_file(ids_file)
-            if ids_obj:
-                result = validate_ifc_against_ids(ifc_model, ids_obj, ifc_path.name, ids_file.name)
-                results.append(result.to_dict())
+        ids_files.extend(list_default_ids_files())
+        
+        # Files that fail to load are dropped
+        ids_items = [
+            (ids_file.name, ids_obj)
+            for ids_file, ids_obj in zip(ids_files, map(load_ids_file, ids_files))
+            if ids_obj
+        ]
+        
+        # One pass over the model for every IDS file keeps ifctester's lookups warm
+        for result in validate_ifc_against_many_ids(ifc_model, ids_items, ifc_path.name):
+            results.append(result.to_dict())
     
     # Calculate overall stats
     total_specs = sum(r["totalSpecs"] for r in results)